@@ -0,0 +1,72 @@
+"""Index build time and search latency of the Library at 10k resources.
+
+Run with:  python bench/bench_library.py [--items 10000]
+
+The catalogue is grown from data/library.json by recombining its titles
+and tags, so term frequencies look like the real thing.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from nexo.library import TRACKS, ResourceLibrary
+
+QUERIES = ["sql", "python back", "docker", "machine learning", "dsa", "aws cert", "react", "p"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with open(ROOT / "data" / "library.json", encoding="utf-8") as f:
+        seed = json.load(f)["resources"]
+    words = [w for r in seed for w in r["title"].split()]
+    tags = sorted({t for r in seed for t in r["tags"]})
+    catalogue = [
+        {
+            "title": " ".join(rng.sample(words, 4)),
+            "url": f"https://example.com/{i}",
+            "track": rng.choice(TRACKS),
+            "topic": rng.choice(seed)["topic"],
+            "tags": rng.sample(tags, 4),
+        }
+        for i in range(args.items)
+    ]
+
+    started = time.perf_counter()
+    library = ResourceLibrary(catalogue)
+    print(f"index build: {(time.perf_counter() - started) * 1000:.0f} ms for {len(library)} resources")
+
+    timings = []
+    for query in QUERIES:
+        for track in (None, *TRACKS):
+            library._match.cache_clear()
+            started = time.perf_counter()
+            library.search(query, track)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(f"search (uncached): p50 {statistics.median(timings):.2f} ms  "
+          f"p99 {timings[int(0.99 * (len(timings) - 1))]:.2f} ms  max {timings[-1]:.2f} ms")
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        library.search("sql", "Data/ML", page=1)
+    print(f"search (cached page change): {(time.perf_counter() - started) * 1000:.1f} µs per call")
+
+    plan = " ".join(rng.choices(words + tags, k=400))
+    started = time.perf_counter()
+    library._link_uncached(plan, 6)
+    print(f"link a 400-word plan: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Time the combined History PDF export for a large history.
+
+Run with:  python bench/bench_pdf_export.py [--plans 100]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from nexo.pdf_export import layout_markdown, render_pdf
+
+PLAN = """## Career Direction
+**Recommended role:** SDE-1 – backend focus.
+
+### Short term (0–3 months)
+- Revise **DSA**: arrays, strings, trees, graphs
+- Finish one end-to-end project and deploy it
+  - Write a README with screenshots
+
+### Mid term (3–12 months)
+1. Contribute to an open-source project
+2. Practise 3 mock interviews a week
+
+| Week | Topic |
+|------|-------|
+| 1 | Arrays and hashing |
+
+---
+""" + "Keep a weekly log of what you learned and what you shipped, and review it every Sunday. " * 25
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--plans", type=int, default=100)
+    args = parser.parse_args()
+
+    documents = [(f"Career Direction – plan {i}", "B.Tech CSE | Python, DSA", f"{PLAN}\n{i}") for i in range(args.plans)]
+    for label in ("cold", "warm"):
+        started = time.perf_counter()
+        pdf = render_pdf(documents)
+        print(f"{label}: {args.plans} plans in {time.perf_counter() - started:.2f} s ({len(pdf) / 1024:.0f} KiB)")
+    print(f"layout cache: {layout_markdown.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Rate-limit throughput of N replicas with local vs shared (Redis) state.
+
+Run with:  python bench/bench_shared_state.py [--redis-url redis://localhost:6379/15]
+
+Without --redis-url an in-process fakeredis server stands in for Redis.
+Each replica gets its own client and RequestEngine-style bucket and asks
+for --demand requests per second. With local state each replica enforces
+the quota on its own, so N replicas overrun it N times; with shared state
+granted throughput adds up linearly until it reaches the quota and then
+stays there.
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from nexo.cache import ResponseCache
+from nexo.state import LocalState, RedisState
+
+
+def make_client(args, server):
+    if args.redis_url:
+        import redis
+
+        return redis.Redis.from_url(args.redis_url)
+    import fakeredis
+
+    return fakeredis.FakeRedis(server=server)
+
+
+def run_replicas(states, quota_per_minute, demand, seconds):
+    buckets = [state.token_bucket("requests", quota_per_minute) for state in states]
+    # Start empty, so the result is the refill rate, not the initial burst.
+    # Shared replicas all see one bucket, so it is drained once.
+    for bucket in buckets[:1] if states[0].shared else buckets:
+        bucket.consume(bucket.available())
+    granted = [0] * len(buckets)
+    deadline = time.monotonic() + seconds
+
+    def replica(i):
+        next_at = time.monotonic()
+        while True:
+            buckets[i].acquire()
+            if time.monotonic() > deadline:
+                return
+            granted[i] += 1
+            next_at += 1 / demand
+            time.sleep(max(0.0, next_at - time.monotonic()))
+
+    threads = [threading.Thread(target=replica, args=(i,)) for i in range(len(buckets))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(granted) / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--redis-url", default="")
+    parser.add_argument("--quota", type=float, default=600, help="requests per minute for the whole account")
+    parser.add_argument("--demand", type=float, default=4.0, help="requests per second each replica wants")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--replicas", default="1,2,4")
+    args = parser.parse_args()
+
+    server = None
+    if not args.redis_url:
+        import fakeredis
+
+        server = fakeredis.FakeServer()
+
+    print(f"quota {args.quota / 60:.1f} req/s, demand {args.demand:.1f} req/s per replica")
+    print(f"{'replicas':>8}  {'backend':>7}  {'granted req/s':>13}")
+    for count in (int(n) for n in args.replicas.split(",")):
+        for name in ("local", "shared"):
+            if name == "local":
+                states = [LocalState() for _ in range(count)]
+            else:
+                prefix = f"nexo-bench-{time.time_ns()}:"
+                states = [RedisState(make_client(args, server), prefix) for _ in range(count)]
+            rate = run_replicas(states, args.quota, args.demand, args.seconds)
+            print(f"{count:>8}  {name:>7}  {rate:>13.1f}")
+
+    # An answer cached by one replica is a hit on another.
+    prefix = f"nexo-bench-{time.time_ns()}:"
+    a, b = (ResponseCache(store=RedisState(make_client(args, server), prefix).cache_store(60)) for _ in range(2))
+    a.set("key", "answer")
+    print(f"cross-replica cache hit: {b.get('key') == 'answer'}")
+
+
+if __name__ == "__main__":
+    main()
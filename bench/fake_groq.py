@@ -0,0 +1,183 @@
+"""Local stand-in for the Groq chat completions API.
+
+Speaks the OpenAI-compatible /openai/v1/chat/completions endpoint (plain
+and SSE streaming) with configurable first-token latency, token rate and
+injected 429s, so the app and benchmarks can run fully offline.
+
+Run standalone:
+    python bench/fake_groq.py --port 8787 --ttft 0.3 --tokens-per-second 250 --error-rate 0.05
+then start the app with GROQ_BASE_URL=http://127.0.0.1:8787.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ANSWER_WORDS = (
+    "## Plan\n\n### Short-term (0–3 months)\n- Revise DSA daily\n- Build one project\n\n"
+    "### Mid-term (3–12 months)\n- Internship applications\n\n### Long-term (1–3 years)\n- Specialise\n\n"
+    "### Sample questions\n- How does a hash map handle collisions?\n- What is a deadlock?\n"
+).split(" ")
+
+# Sent when the request asks for response_format json_object (structured plans).
+PLAN_ANSWER = json.dumps({
+    "summary": "Focus on DSA and one solid project first, then internships, then specialise.",
+    "phases": [
+        {"focus": "Foundations", "steps": ["Revise DSA daily", "Build one project"],
+         "topics": [{"name": "Arrays and hashing", "priority": "high"}, {"name": "SQL", "priority": "medium"}]},
+        {"focus": "Experience", "steps": ["Apply for internships", "Contribute to open source"],
+         "topics": [{"name": "System design basics", "priority": "medium"}]},
+        {"focus": "Specialise", "steps": ["Pick a track and go deep"],
+         "topics": [{"name": "Cloud", "priority": "low"}]},
+    ],
+    "questions": [
+        {"question": "How does a hash map handle collisions?", "answer": "Chaining or open addressing."},
+        {"question": "What is a deadlock?", "answer": "Cyclic wait on locks; name the four conditions."},
+    ],
+}, indent=1).split(" ")
+
+
+class FakeGroqStats:
+    def __init__(self):
+        self.requests = 0
+        self.rate_limited = 0
+        self.streamed = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def add(self, **deltas):
+        with self._lock:
+            for name, value in deltas.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "streamed": self.streamed,
+            "completion_tokens": self.completion_tokens,
+        }
+
+
+def answer_tokens(count: int, structured: bool = False):
+    if structured:
+        # A plan can't be repeated to fill count; cutting it short gives invalid JSON, as a real model would.
+        return [word + " " for word in PLAN_ANSWER[:count]]
+    return [ANSWER_WORDS[i % len(ANSWER_WORDS)] + " " for i in range(count)]
+
+
+def make_handler(ttft, tokens_per_second, error_rate, completion_tokens, stats, rng):
+    class FakeGroqHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _json(self, status, payload, headers=None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if not self.path.endswith("/chat/completions"):
+                self._json(404, {"error": {"message": "not found"}})
+                return
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            stats.add(requests=1)
+            if rng.random() < error_rate:
+                stats.add(rate_limited=1)
+                self._json(
+                    429,
+                    {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                    {"retry-after": "0.2"},
+                )
+                return
+
+            limit = min(completion_tokens, request.get("max_tokens") or completion_tokens)
+            structured = (request.get("response_format") or {}).get("type") == "json_object"
+            tokens = answer_tokens(limit, structured)
+            limit = len(tokens)
+            prompt_tokens = sum(len(m.get("content", "")) for m in request.get("messages", [])) // 4
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": limit, "total_tokens": prompt_tokens + limit}
+            stats.add(completion_tokens=limit)
+            time.sleep(ttft)
+            if request.get("stream"):
+                self._stream(request, tokens, usage)
+            else:
+                time.sleep(limit / tokens_per_second)
+                self._json(200, {
+                    "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+                    "model": request.get("model"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": "".join(tokens)}}],
+                    "usage": usage,
+                })
+
+        def _stream(self, request, tokens, usage):
+            stats.add(streamed=1)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def send(payload):
+                data = f"data: {payload}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            base = {"id": "chatcmpl-fake", "object": "chat.completion.chunk",
+                    "created": int(time.time()), "model": request.get("model")}
+            # Flush a few tokens per chunk, paced to tokens_per_second.
+            step = 4
+            for i in range(0, len(tokens), step):
+                delta = {"content": "".join(tokens[i:i + step])}
+                send(json.dumps({**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}))
+                time.sleep(step / tokens_per_second)
+            send(json.dumps({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                             "x_groq": {"usage": usage}}))
+            send("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+
+    return FakeGroqHandler
+
+
+def start_fake_groq(port=0, ttft=0.3, tokens_per_second=250.0, error_rate=0.0, completion_tokens=400, seed=0):
+    """Start the server on a daemon thread; returns (server, stats, base_url)."""
+    stats = FakeGroqStats()
+    handler = make_handler(ttft, tokens_per_second, error_rate, completion_tokens, stats, random.Random(seed))
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="fake-groq").start()
+    return server, stats, f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--ttft", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=250.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--completion-tokens", type=int, default=400)
+    args = parser.parse_args()
+
+    server, stats, url = start_fake_groq(
+        args.port, args.ttft, args.tokens_per_second, args.error_rate, args.completion_tokens
+    )
+    print(f"fake Groq listening on {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(10)
+            print(json.dumps(stats.as_dict()))
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""Offline load test: N simulated users against one streamlit_app.py server.
+
+Starts the local Groq stand-in (bench/fake_groq.py) and a real headless
+`streamlit run` process pointed at it, then drives that server over its
+websocket protocol the way browsers do. Each simulated user opens a fresh
+session, submits either the Career Direction or the Interview Prep form
+(selecting that tab first), and triggers one plain rerun. Reports
+cold start (process start to healthy, and the first script run), throughput,
+end-to-end submit latency, per-rerun script time (client round trip and
+server-side, from the app's own metrics) and server memory per session.
+
+    python bench/load_test.py --users 40 --concurrency 8 --json bench_output.json
+
+--distinct controls how many different profiles the users draw from, so
+cache and single-flight effects can be switched on (low) or off (high).
+Nothing leaves the machine, so this runs in CI.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "bench"))
+
+from fake_groq import start_fake_groq
+
+SKILLS = ["Python", "Java", "C++", "DSA", "SQL", "React", "Node", "ML", "Docker", "AWS", "Excel", "Go", "Rust",
+          "Kotlin", "Power BI", "Tableau", "Linux", "Kubernetes", "Spring", "Django", "Figma", "Flutter"]
+ROLES = ["SDE-1", "Data Analyst", "ML Engineer", "DevOps Engineer", "Data Scientist", "Frontend Developer"]
+EDUCATION = ["B.Tech CSE, Final year", "BCA, 3rd year", "MCA", "B.Sc Maths", "B.Tech IT, 3rd year"]
+COMPANIES = ["Product company", "TCS NQT", "Infosys", "JP Morgan virtual", "Startup"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_bytes(pid: int) -> int:
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def start_app(workdir: Path, app_port: int, metrics_port: int, groq_url: str, concurrency: int):
+    # Secrets and config live in a scratch directory so the repo is untouched.
+    (workdir / ".streamlit").mkdir(parents=True)
+    shutil.copy(ROOT / ".streamlit" / "config.toml", workdir / ".streamlit" / "config.toml")
+    (workdir / ".streamlit" / "secrets.toml").write_text(
+        'GROQ_API_KEY = "offline-benchmark"\n'
+        "GROQ_REQUESTS_PER_MINUTE = 100000\n"
+        "GROQ_TOKENS_PER_MINUTE = 100000000\n"
+        f"LLM_MAX_IN_FLIGHT = {concurrency}\n"
+        f"METRICS_PORT = {metrics_port}\n"
+        f'HISTORY_DB_PATH = "{workdir / "history.db"}"\n'
+    )
+    env = dict(os.environ, GROQ_BASE_URL=groq_url)
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(ROOT / "streamlit_app.py"),
+         "--server.headless", "true", "--server.port", str(app_port),
+         "--server.enableXsrfProtection", "false", "--browser.gatherUsageStats", "false"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{app_port}/_stcore/health", timeout=1)
+            return process, time.perf_counter() - started
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("streamlit did not start")
+
+
+class Session:
+    # One browser tab: a websocket plus the widget ids seen in the last run.
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets = {}
+        self.tabs = []
+        self.markdown = []
+
+    async def run(self, widget_states=()):
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.widgets.extend(widget_states)
+        await self.ws.send(msg.SerializeToString())
+        self.markdown = []
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "add_block":
+                block = fwd.delta.add_block
+                if block.WhichOneof("type") == "tab_container" and block.tab_container.id not in self.tabs:
+                    self.tabs.append(block.tab_container.id)
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                widget = getattr(element, element.WhichOneof("type"))
+                if getattr(widget, "id", "") and getattr(widget, "label", ""):
+                    self.widgets[widget.label] = widget.id
+                if element.WhichOneof("type") == "markdown":
+                    self.markdown.append(element.markdown.body)
+                elif element.WhichOneof("type") == "html":
+                    # Structured plans arrive as pre-rendered HTML.
+                    self.markdown.append(element.html.body)
+            elif kind == "script_finished":
+                return
+
+    def text(self, label, value):
+        state = WidgetState(id=self.widgets[label])
+        state.string_value = value
+        return state
+
+    def tab(self, label):
+        # The Home tabs are a keyed widget whose value is the open tab's label.
+        state = WidgetState(id=self.tabs[0])
+        state.string_value = label
+        return state
+
+    def click(self, label_prefix):
+        label = next(label for label in self.widgets if label.startswith(label_prefix))
+        state = WidgetState(id=self.widgets[label])
+        state.trigger_value = True
+        return state
+
+
+def user_tab(user: int) -> str:
+    return "Career Direction" if user % 2 == 0 else "Interview Prep"
+
+
+def profile_states(session: Session, user: int, distinct: int):
+    rng = random.Random(user % distinct)
+    skills = ", ".join(rng.sample(SKILLS, 4))
+    if user % 2 == 0:
+        return [
+            session.tab(user_tab(user)),
+            session.text("Education", rng.choice(EDUCATION)),
+            session.text("What skills / technologies do you know?", skills),
+            session.text("Target role(s)", rng.choice(ROLES)),
+            session.click("Generate Career Plan"),
+        ]
+    return [
+        session.tab(user_tab(user)),
+        session.text("Target role", rng.choice(ROLES)),
+        session.text("Company / type of company", rng.choice(COMPANIES)),
+        session.text("Weak areas", skills),
+        session.click("Generate Interview Plan"),
+    ]
+
+
+async def simulate_user(url, user, distinct, gate, open_sockets, results):
+    async with gate:
+        ws = await websockets.connect(url, max_size=None)
+        open_sockets.append(ws)
+        session = Session(ws)
+
+        t0 = time.perf_counter()
+        await session.run()
+        cold = time.perf_counter() - t0
+        if user_tab(user) != "Career Direction":
+            # Open the tab so its form's widget ids are known, as a click would.
+            await session.run([session.tab(user_tab(user))])
+
+        t0 = time.perf_counter()
+        await session.run(profile_states(session, user, distinct))
+        submit = time.perf_counter() - t0
+        failed = not any("ai-response" in body and "❌" not in body for body in session.markdown)
+
+        t0 = time.perf_counter()
+        await session.run([session.tab(user_tab(user))])
+        rerun = time.perf_counter() - t0
+        results.append({"cold": cold, "submit": submit, "rerun": rerun, "failed": failed})
+
+
+def scrape_script_time(metrics_port: int):
+    text = urllib.request.urlopen(f"http://127.0.0.1:{metrics_port}/metrics", timeout=5).read().decode()
+    total = sum(float(v) for v in re.findall(r"^nexo_script_run_seconds_sum\{[^}]*\} (\S+)$", text, re.M))
+    count = sum(float(v) for v in re.findall(r"^nexo_script_run_seconds_count\{[^}]*\} (\S+)$", text, re.M))
+    return total / count if count else float("nan")
+
+
+async def drive(args, app_port, pid):
+    url = f"ws://127.0.0.1:{app_port}/_stcore/stream"
+    # Warm-up session so process start-up costs are not charged to users.
+    warm = await websockets.connect(url, max_size=None)
+    t0 = time.perf_counter()
+    await Session(warm).run()
+    first_run = time.perf_counter() - t0
+    rss_before = rss_bytes(pid)
+
+    gate = asyncio.Semaphore(args.concurrency)
+    open_sockets, results = [warm], []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        simulate_user(url, user, args.distinct, gate, open_sockets, results) for user in range(args.users)
+    ))
+    wall = time.perf_counter() - started
+    # Sockets stay open until here so every session is still resident.
+    rss_after = rss_bytes(pid)
+    for ws in open_sockets:
+        await ws.close()
+    return results, wall, (rss_after - rss_before) / args.users, first_run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8, help="users active at the same time")
+    parser.add_argument("--distinct", type=int, default=1000, help="number of distinct profiles")
+    parser.add_argument("--ttft", type=float, default=0.2)
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--completion-tokens", type=int, default=300)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of model calls answered with 429")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    fake_server, fake_stats, groq_url = start_fake_groq(
+        ttft=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        completion_tokens=args.completion_tokens,
+    )
+    app_port, metrics_port = free_port(), free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        process, startup = start_app(Path(tmp), app_port, metrics_port, groq_url, args.concurrency)
+        try:
+            results, wall, rss_per_session, first_run = asyncio.run(drive(args, app_port, process.pid))
+            server_script_mean = scrape_script_time(metrics_port)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+            fake_server.shutdown()
+
+    submits = [r["submit"] for r in results]
+    reruns = [r["rerun"] for r in results]
+    report = {
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "distinct_profiles": args.distinct,
+        "server_startup_ms": round(startup * 1000, 1),
+        "first_script_run_ms": round(first_run * 1000, 1),
+        "wall_seconds": round(wall, 3),
+        "throughput_submits_per_second": round(args.users / wall, 3),
+        "submit_p50_ms": round(percentile(submits, 0.5) * 1000, 1),
+        "submit_p99_ms": round(percentile(submits, 0.99) * 1000, 1),
+        "cold_run_p50_ms": round(percentile([r["cold"] for r in results], 0.5) * 1000, 1),
+        "rerun_p50_ms": round(percentile(reruns, 0.5) * 1000, 1),
+        "rerun_p99_ms": round(percentile(reruns, 0.99) * 1000, 1),
+        "server_script_run_mean_ms": round(server_script_mean * 1000, 1),
+        "rss_per_session_kb": round(rss_per_session / 1024, 1),
+        "failed_submits": sum(r["failed"] for r in results),
+        "fake_groq": fake_stats.as_dict(),
+    }
+    width = max(len(key) for key in report)
+    for key, value in report.items():
+        print(f"{key:<{width}}  {value}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Generate career plans for a whole cohort from a CSV or JSONL file.
+
+    GROQ_API_KEY=... python -m nexo.batch students.csv plans.jsonl --markdown plans.md
+
+Rows need the Career Direction form fields (name, education, skills,
+interests, target_roles, notes); missing columns are treated as empty.
+Each finished plan is appended to the JSONL file straight away, and a
+rerun skips every row already in it, so a crash never re-spends tokens.
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from nexo.budget import PromptBudget
+from nexo.engine import DEFAULT_MODEL, RequestEngine
+from nexo.prompts import CAREER_FIELDS, build_career_prompt, build_messages
+
+
+def parse_rows(text: str, filename: str):
+    """Rows of the Career Direction form fields, each with an "id".
+
+    Raises ValueError naming the first line that can't be read.
+    """
+    if filename.lower().endswith((".jsonl", ".ndjson")):
+        records = []
+        for number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"line {number} is not valid JSON ({e.msg})") from None
+            if not isinstance(record, dict):
+                raise ValueError(f"line {number} is not a JSON object")
+            records.append(record)
+    else:
+        try:
+            records = list(csv.DictReader(io.StringIO(text)))
+        except csv.Error as e:
+            raise ValueError(f"not a readable CSV file ({e})") from None
+    rows = []
+    for record in records:
+        record = {key.strip().lower(): value for key, value in record.items() if key}
+        row = {field: str(record.get(field) or "").strip() for field in CAREER_FIELDS}
+        row["id"] = str(record.get("id") or row_id(row))
+        rows.append(row)
+    return rows
+
+
+def row_id(row) -> str:
+    # Content hash, so reordering the input file does not break resuming.
+    raw = "\x1f".join(" ".join(row[field].split()).lower() for field in CAREER_FIELDS)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def completed_ids(output_path: str):
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+            if record.get("output"):
+                done.add(record["id"])
+    return done
+
+
+def generate_plan(engine: RequestEngine, row, model: str, temperature: float, budget: PromptBudget):
+    fields, decision = budget.fit("career_direction", {field: row[field] for field in CAREER_FIELDS})
+    completion = engine.complete(
+        model=model,
+        messages=build_messages(build_career_prompt(**fields), "career_direction"),
+        temperature=temperature,
+        max_tokens=decision.max_tokens,
+    )
+    if completion.usage is not None and completion.usage.completion_tokens:
+        budget.record_output("career_direction", completion.usage.completion_tokens)
+    return completion.choices[0].message.content
+
+
+def run_batch(rows, output_path: str, engine: RequestEngine, model: str = DEFAULT_MODEL,
+              temperature: float = 0.6, concurrency: int = 4, markdown_path: str = None,
+              budget: PromptBudget = None):
+    """Yield one result dict per finished row, appending it to the output files.
+
+    Rows already present in output_path are skipped. Failed rows are written
+    with an "error" key and retried on the next run.
+    """
+    done = completed_ids(output_path)
+    pending = [row for row in rows if row["id"] not in done]
+    budget = budget or PromptBudget()
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="nexo-batch")
+    try:
+        with open(output_path, "a", encoding="utf-8") as out, \
+                open(markdown_path or os.devnull, "a", encoding="utf-8") as md:
+            futures = {pool.submit(generate_plan, engine, row, model, temperature, budget): row for row in pending}
+            for future in as_completed(futures):
+                row = futures[future]
+                result = {"id": row["id"], "name": row["name"], "education": row["education"],
+                          "target_roles": row["target_roles"]}
+                try:
+                    result["output"] = future.result()
+                except Exception as e:
+                    result["error"] = str(e)
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                if "output" in result:
+                    title = row["name"] or row["id"]
+                    md.write(f"# {title}\n\n_{row['education']} | {row['target_roles']}_\n\n{result['output']}\n\n---\n\n")
+                    md.flush()
+                yield result
+    finally:
+        # If the consumer stops early, don't start rows nobody will record.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class BatchRun:
+    """A run_batch call on a background thread, polled by the UI.
+
+    done counts rows with a plan (including ones finished by an earlier
+    run), failed the rows that errored this time. error is set if the run
+    itself stopped, e.g. the output file couldn't be written.
+    """
+
+    def __init__(self, rows, output_path: str, engine: RequestEngine, **kwargs):
+        self.total = len(rows)
+        self.done = len(completed_ids(output_path) & {row["id"] for row in rows})
+        self.failed = 0
+        self.error = None
+        self.finished = False
+        self._args = (rows, output_path, engine)
+        self._kwargs = kwargs
+
+    def start(self, executor):
+        executor.submit(self._run)
+        return self
+
+    def _run(self):
+        try:
+            for result in run_batch(*self._args, **self._kwargs):
+                if "output" in result:
+                    self.done += 1
+                else:
+                    self.failed += 1
+        except Exception as e:
+            logging.getLogger("nexo.batch").exception("batch run failed")
+            self.error = e
+        finally:
+            self.finished = True
+
+
+class BatchRuns:
+    # At most one running BatchRun per output file in this process. Output
+    # files are named after the upload's content, so sessions uploading the
+    # same cohort share one run instead of both appending to the file (and
+    # both paying for every plan).
+
+    def __init__(self, executor):
+        self._executor = executor
+        self._runs = {}
+        self._lock = threading.Lock()
+
+    def start(self, output_path: str, make_run) -> BatchRun:
+        """The running BatchRun for output_path, else make_run() started now."""
+        with self._lock:
+            run = self._runs.get(output_path)
+            if run is None or run.finished:
+                run = self._runs[output_path] = make_run().start(self._executor)
+            return run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or JSONL file with one student per row")
+    parser.add_argument("output", help="JSONL file results are appended to (also the resume log)")
+    parser.add_argument("--markdown", help="also append each plan to this Markdown file")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests-per-minute", type=float, default=30)
+    parser.add_argument("--tokens-per-minute", type=float, default=8000)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--temperature", type=float, default=0.6)
+    args = parser.parse_args(argv)
+    logging.basicConfig(format="%(name)s %(message)s")
+    logging.getLogger("nexo").setLevel(logging.INFO)
+
+    from groq import Groq
+
+    with open(args.input, encoding="utf-8-sig") as f:
+        rows = parse_rows(f.read(), args.input)
+    engine = RequestEngine(
+        Groq(api_key=os.environ["GROQ_API_KEY"], max_retries=0),
+        max_in_flight=args.concurrency,
+        requests_per_minute=args.requests_per_minute,
+        tokens_per_minute=args.tokens_per_minute,
+    )
+    done = completed_ids(args.output)
+    print(f"{len(rows)} rows, {sum(row['id'] in done for row in rows)} already done", file=sys.stderr)
+    failed = 0
+    for i, result in enumerate(run_batch(rows, args.output, engine, args.model, args.temperature,
+                                         args.concurrency, args.markdown), start=1):
+        failed += "error" in result
+        status = "error: " + result["error"] if "error" in result else "ok"
+        print(f"[{i}] {result['id']} {status}", file=sys.stderr)
+    engine.shutdown()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
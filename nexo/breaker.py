@@ -0,0 +1,114 @@
+import logging
+import threading
+import time
+from collections import deque
+
+log = logging.getLogger("nexo.breaker")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+# Besides 5xx: the provider is overloaded or out of quota.
+FAILURE_STATUS = {408, 429}
+
+
+def is_model_failure(exc) -> bool:
+    # Timeouts, connection errors, 429 and 5xx say the model is unhealthy.
+    # Other 4xx (bad request, context too long) are about one prompt, and a
+    # few of them must not open the circuit for everyone.
+    import groq
+
+    if isinstance(exc, (groq.APIConnectionError, TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    return status is not None and (status in FAILURE_STATUS or status >= 500)
+
+
+class CircuitOpen(Exception):
+    # Raised instead of calling the model while the breaker is open.
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"the model isn't responding; trying again in {max(1, round(retry_in))} s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Stops calling the model while it is failing or slow.
+
+    Each call reports record(ok, seconds), where seconds is the time to the
+    first text. Once min_calls of the last `window` calls are in and the
+    share of errors reaches error_rate, or the share slower than
+    slow_seconds reaches slow_rate, the breaker opens: allow() says no for
+    open_seconds. Then it goes half-open and lets a single probe through;
+    a good probe closes it, a failed or slow one opens it again. A probe
+    that never reports is replaced after another open_seconds. Calls that
+    say nothing about the model's health report release() instead.
+    """
+
+    def __init__(self, window: int = 20, min_calls: int = 5, error_rate: float = 0.5,
+                 slow_seconds: float = 10.0, slow_rate: float = 0.5, open_seconds: float = 30.0,
+                 on_change=None):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_seconds = slow_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._on_change = on_change
+        self._calls = deque(maxlen=window)
+        self._changed = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _set(self, state: str, reason: str = ""):
+        self.state, self._changed = state, time.monotonic()
+        if state != HALF_OPEN:
+            self._calls.clear()
+        log.warning("circuit %s%s", state, f" ({reason})" if reason else "")
+        if self._on_change is not None:
+            self._on_change(state)
+
+    def retry_in(self) -> float:
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            return max(0.0, self._changed + self.open_seconds - time.monotonic())
+
+    def is_open(self) -> bool:
+        # True while calls are refused outright; doesn't start a probe.
+        return self.retry_in() > 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if time.monotonic() - self._changed < self.open_seconds:
+                return False
+            # Open long enough, or the last probe went quiet: let one call through.
+            self._set(HALF_OPEN)
+            return True
+
+    def release(self):
+        # Neither success nor failure; if it was the probe, the next call probes.
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._changed = time.monotonic() - self.open_seconds
+
+    def record(self, ok: bool, seconds: float):
+        slow = seconds >= self.slow_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if ok and not slow:
+                    self._set(CLOSED, "probe succeeded")
+                else:
+                    self._set(OPEN, "probe failed" if not ok else f"probe took {seconds:.1f} s")
+                return
+            if self.state == OPEN:
+                # A call let through before the breaker opened.
+                return
+            self._calls.append((ok, slow))
+            if len(self._calls) < self.min_calls:
+                return
+            errors = sum(not ok for ok, _ in self._calls) / len(self._calls)
+            slow_calls = sum(slow for _, slow in self._calls) / len(self._calls)
+            if errors >= self.error_rate:
+                self._set(OPEN, f"{errors:.0%} of recent calls failed")
+            elif slow_calls >= self.slow_rate:
+                self._set(OPEN, f"{slow_calls:.0%} of recent calls took over {self.slow_seconds:g} s")
@@ -0,0 +1,163 @@
+import logging
+import math
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+log = logging.getLogger("nexo.budget")
+
+# Rough BPE stand-in: short words are one token, long words, digit runs
+# and punctuation cost more. Within ~10-15% of the real tokenizer for
+# English form input, which is plenty for budgeting.
+PIECE_RE = re.compile(r"[^\W\d_]+|\d+|[^\w\s]")
+LIST_SPLIT_RE = re.compile(r"\s*(?:[,;\n]|\s•\s)\s*")
+BULLET_RE = re.compile(r"^[-*•]\s+")
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Free-text fields that are really lists ("Python, SQL, python, DSA").
+LIST_FIELDS = frozenset({"skills", "interests", "target_roles", "strong_areas", "weak_areas"})
+DEFAULT_INPUT_BUDGETS = {"career_direction": 350, "interview_prep": 350}
+TRIM_MARKER = " […]"
+
+
+def count_tokens(text: str) -> int:
+    tokens = 0
+    for piece in PIECE_RE.findall(text):
+        if piece[0].isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif piece[0].isalpha():
+            tokens += 1 + len(piece) // 8
+        else:
+            tokens += 1
+    return tokens
+
+
+def compact(text: str, as_list: bool = False) -> str:
+    """Collapse whitespace and drop repeated sentences (or list items for list fields)."""
+    if as_list:
+        seen, items = set(), []
+        for item in LIST_SPLIT_RE.split(text):
+            item = " ".join(BULLET_RE.sub("", item.strip()).split())
+            if item and item.casefold() not in seen:
+                seen.add(item.casefold())
+                items.append(item)
+        return ", ".join(items)
+    seen, lines = set(), []
+    for line in text.splitlines():
+        kept = []
+        for sentence in SENTENCE_RE.split(" ".join(line.split())):
+            if sentence and sentence.casefold() not in seen:
+                seen.add(sentence.casefold())
+                kept.append(sentence)
+        if kept:
+            lines.append(" ".join(kept))
+        elif not line.strip() and lines and lines[-1]:
+            lines.append("")
+    return "\n".join(lines).strip()
+
+
+def truncate(text: str, max_tokens: int, as_list: bool = False) -> str:
+    if count_tokens(text) <= max_tokens:
+        return text
+    used, end = count_tokens(TRIM_MARKER), 0
+    for match in PIECE_RE.finditer(text):
+        used += count_tokens(match.group())
+        if used > max_tokens:
+            break
+        end = match.end()
+    head = text[:end]
+    # Keep whole list items / sentences when the cut lands close to one.
+    boundary = head.rfind(", ") if as_list else max(head.rfind(". "), head.rfind("\n"))
+    if boundary > len(head) * 0.6:
+        head = head[:boundary + (0 if as_list else 1)]
+    return head.rstrip(" ,;") + TRIM_MARKER
+
+
+def allocate(sizes, budget: int):
+    """Water-fill a token budget: small fields keep everything, big ones share the rest."""
+    limits = dict(sizes)
+    if sum(sizes.values()) <= budget:
+        return limits
+    remaining = budget
+    ordered = sorted(sizes.items(), key=lambda item: item[1])
+    for i, (field, size) in enumerate(ordered):
+        share = remaining // (len(ordered) - i)
+        if size <= share:
+            remaining -= size
+            continue
+        for other, _ in ordered[i:]:
+            limits[other] = share
+        break
+    return limits
+
+
+@dataclass(slots=True)
+class BudgetDecision:
+    mode: str
+    input_budget: int
+    tokens_before: int
+    tokens_after: int
+    trimmed: tuple
+    max_tokens: int
+
+    def __str__(self):
+        trimmed = ",".join(self.trimmed) or "-"
+        return (f"mode={self.mode} input={self.tokens_before}->{self.tokens_after}/{self.input_budget} "
+                f"trimmed={trimmed} max_tokens={self.max_tokens}")
+
+
+class PromptBudget:
+    """Per-mode input budgets for form fields and output budgets learned from usage.
+
+    max_tokens starts at the ceiling and, once enough answers have been seen,
+    tracks the p95 completion length plus headroom, so short modes stop
+    reserving 2048 tokens of rate-limit budget for answers that never come.
+    """
+
+    def __init__(self, input_budgets=None, max_tokens_floor: int = 512, max_tokens_ceiling: int = 2048,
+                 headroom: float = 1.25, window: int = 200, min_samples: int = 20):
+        self.input_budgets = {**DEFAULT_INPUT_BUDGETS, **(input_budgets or {})}
+        self.max_tokens_floor = max_tokens_floor
+        self.max_tokens_ceiling = max_tokens_ceiling
+        self.headroom = headroom
+        self.window = window
+        self.min_samples = min_samples
+        self._outputs = {}
+        self._lock = threading.Lock()
+
+    def record_output(self, mode: str, completion_tokens: int):
+        with self._lock:
+            self._outputs.setdefault(mode, deque(maxlen=self.window)).append(completion_tokens)
+
+    def max_tokens(self, mode: str) -> int:
+        with self._lock:
+            observed = sorted(self._outputs.get(mode, ()))
+        if len(observed) < self.min_samples:
+            return self.max_tokens_ceiling
+        p95 = observed[min(len(observed) - 1, int(0.95 * len(observed)))]
+        # Round up to a multiple of 64 so the value doesn't jitter every call.
+        wanted = math.ceil(p95 * self.headroom / 64) * 64
+        return max(self.max_tokens_floor, min(self.max_tokens_ceiling, wanted))
+
+    def fit(self, mode: str, fields):
+        """Return (compacted and trimmed fields, BudgetDecision); logs the decision."""
+        budget = self.input_budgets.get(mode, max(DEFAULT_INPUT_BUDGETS.values()))
+        before = sum(count_tokens(value) for value in fields.values())
+        compacted = {field: compact(value, field in LIST_FIELDS) for field, value in fields.items()}
+        limits = allocate({field: count_tokens(value) for field, value in compacted.items()}, budget)
+        fitted, trimmed = {}, []
+        for field, value in compacted.items():
+            fitted[field] = truncate(value, limits[field], field in LIST_FIELDS)
+            if fitted[field] != value:
+                trimmed.append(field)
+        decision = BudgetDecision(
+            mode=mode,
+            input_budget=budget,
+            tokens_before=before,
+            tokens_after=sum(count_tokens(value) for value in fitted.values()),
+            trimmed=tuple(trimmed),
+            max_tokens=self.max_tokens(mode),
+        )
+        log.info("prompt budget %s", decision)
+        return fitted, decision
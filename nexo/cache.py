@@ -0,0 +1,150 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_prompt(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def make_cache_key(user_message: str, mode: str, temperature: float, model: str) -> str:
+    raw = "\x1f".join([normalize_prompt(user_message), mode, f"{float(temperature):.2f}", model])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SQLiteCacheStore:
+    # Optional on-disk layer so cached answers survive restarts.
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+
+    def get(self, key: str, ttl_seconds: float):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > ttl_seconds:
+            return None
+        return row[0], row[1]
+
+    def set(self, key: str, value: str, created: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, created) VALUES (?, ?, ?)",
+                (key, value, created),
+            )
+
+    def prune(self, ttl_seconds: float):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM response_cache WHERE created < ?", (time.time() - ttl_seconds,))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM response_cache")
+
+
+class RedisCacheStore:
+    # Shared layer: every replica reads and writes the same answers.
+    # Redis expires entries itself, so prune() has nothing to do.
+
+    def __init__(self, client, ttl_seconds: float, prefix: str = "nexo:"):
+        self._client = client
+        self._ttl = max(1, int(ttl_seconds))
+        self._prefix = f"{prefix}cache:"
+
+    def get(self, key: str, ttl_seconds: float):
+        value, created = self._client.hmget(self._prefix + key, "value", "created")
+        if value is None or time.time() - float(created) > ttl_seconds:
+            return None
+        return value.decode("utf-8"), float(created)
+
+    def set(self, key: str, value: str, created: float):
+        name = self._prefix + key
+        with self._client.pipeline() as pipe:
+            pipe.hset(name, mapping={"value": value, "created": created})
+            pipe.expire(name, self._ttl)
+            pipe.execute()
+
+    def prune(self, ttl_seconds: float):
+        pass
+
+    def clear(self):
+        for name in self._client.scan_iter(match=self._prefix + "*", count=500):
+            self._client.delete(name)
+
+
+class ResponseCache:
+    # Process-wide LRU + TTL cache for model answers, shared by all sessions.
+    # Misses fall through to store (SQLite or Redis) when one is given.
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 6 * 3600, sqlite_path: str = None,
+                 store=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._store = store or (SQLiteCacheStore(sqlite_path) if sqlite_path else None)
+        if self._store:
+            self._store.prune(ttl_seconds)
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, created = entry
+                if now - created <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        stored = self._store.get(key, self.ttl_seconds) if self._store else None
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                return None
+            self._put(key, stored[0], stored[1])
+            self.hits += 1
+            return stored[0]
+
+    def set(self, key: str, value: str):
+        created = time.time()
+        with self._lock:
+            self._put(key, value, created)
+        if self._store:
+            self._store.set(key, value, created)
+
+    def _put(self, key: str, value: str, created: float):
+        self._entries[key] = (value, created)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+        if self._store:
+            self._store.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
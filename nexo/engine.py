@@ -0,0 +1,295 @@
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from nexo.budget import count_tokens
+
+DEFAULT_MODEL = "openai/gpt-oss-20b"
+RETRYABLE_STATUS = {408, 409, 429}
+# Errors where another model (with its own rate limit) is worth trying at once.
+FALLBACK_STATUS = {408, 429, 503}
+_DONE = object()
+
+
+class _StreamInterrupted(Exception):
+    # The upstream stream failed after chunks were already handed out.
+
+    def __init__(self, cause):
+        super().__init__(str(cause))
+        self.cause = cause
+
+
+def estimate_tokens(messages) -> int:
+    return sum(count_tokens(m["content"]) + 4 for m in messages)
+
+
+def is_retryable(exc) -> bool:
+    import groq
+
+    if isinstance(exc, (groq.APIConnectionError, groq.APITimeoutError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    return status is not None and (status in RETRYABLE_STATUS or status >= 500)
+
+
+def should_fall_back(exc) -> bool:
+    import groq
+
+    if isinstance(exc, groq.APITimeoutError):
+        return True
+    return getattr(exc, "status_code", None) in FALLBACK_STATUS
+
+
+def retry_after_seconds(exc):
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    # Refills continuously at rate_per_minute. consume() may push the level
+    # below zero (e.g. when actual usage is only known after the call), and
+    # later acquire() calls wait until the debt is paid back.
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0):
+        amount = min(amount, self.capacity)
+        with self._cond:
+            while True:
+                self._refill()
+                if self._level >= amount:
+                    self._level -= amount
+                    return
+                self._cond.wait((amount - self._level) / self.rate)
+
+    def consume(self, amount: float):
+        with self._cond:
+            self._refill()
+            self._level -= amount
+
+    def available(self) -> float:
+        with self._cond:
+            self._refill()
+            return self._level
+
+
+# Refill and take in one step on the server, so replicas can't race each
+# other between reading the level and writing it back.
+# ARGV: now, rate per second, capacity, amount, op ("take" or "consume"), idle ttl.
+# Returns {seconds to wait (0 when granted), level}; numbers travel as strings.
+REDIS_BUCKET_SCRIPT = """
+local now, rate, capacity = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local amount, op = tonumber(ARGV[4]), ARGV[5]
+local state = redis.call('HMGET', KEYS[1], 'level', 'updated')
+local level, updated = tonumber(state[1]), tonumber(state[2])
+if level == nil then level, updated = capacity, now end
+level = math.min(capacity, level + math.max(0, now - updated) * rate)
+local wait = 0
+if op == 'take' then
+    if level >= amount then level = level - amount else wait = (amount - level) / rate end
+elseif op == 'consume' then
+    level = level - amount
+end
+redis.call('HSET', KEYS[1], 'level', tostring(level), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[6])
+return {tostring(wait), tostring(level)}
+"""
+
+
+class RedisTokenBucket:
+    # TokenBucket kept in a Redis hash, so every replica draws on the same
+    # per-minute quota. Uses wall-clock time, so replica clocks should be in sync.
+
+    def __init__(self, client, key: str, rate_per_minute: float, capacity: float = None):
+        self.key = key
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._script = client.register_script(REDIS_BUCKET_SCRIPT)
+        # Loaded up front so the first acquire doesn't pay a NOSCRIPT round trip.
+        client.script_load(REDIS_BUCKET_SCRIPT)
+        # An idle bucket is full again after capacity / rate; keep it a bit longer.
+        self._ttl = int(self.capacity / self.rate) + 60
+
+    def _run(self, op: str, amount: float):
+        wait, level = self._script(
+            keys=[self.key], args=[time.time(), self.rate, self.capacity, amount, op, self._ttl]
+        )
+        return float(wait), float(level)
+
+    def acquire(self, amount: float = 1.0):
+        amount = min(amount, self.capacity)
+        while True:
+            wait, _ = self._run("take", amount)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def consume(self, amount: float):
+        self._run("consume", amount)
+
+    def available(self) -> float:
+        return self._run("peek", 0)[1]
+
+
+class StreamHandle:
+    # Iterator over chunks produced by a worker thread. Closing it (or the
+    # consumer going away) tells the worker to stop reading the upstream stream.
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self.cancelled = threading.Event()
+
+    def put(self, item):
+        self._queue.put(item)
+
+    def __iter__(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self.cancelled.set()
+
+    def close(self):
+        self.cancelled.set()
+
+
+class RequestEngine:
+    # Owns the Groq client. Calls run on a bounded thread pool, wait on
+    # request/token buckets sized to the account's per-minute limits, and
+    # retry 429/5xx/connection errors with jittered exponential backoff.
+
+    def __init__(
+        self,
+        client,
+        max_in_flight: int = 8,
+        requests_per_minute: float = 30,
+        tokens_per_minute: float = 8000,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
+        bucket_factory=None,
+    ):
+        # bucket_factory(name, rate_per_minute) builds the request and token
+        # buckets; a shared state backend passes one that all replicas share.
+        self.client = client
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        make_bucket = bucket_factory or (lambda name, rate_per_minute: TokenBucket(rate_per_minute))
+        self.request_bucket = make_bucket("requests", requests_per_minute)
+        self.token_bucket = make_bucket("tokens", tokens_per_minute)
+        self.retries = 0
+        self.fallbacks = 0
+        self._pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="nexo-llm")
+
+    def _backoff(self, attempt: int, exc) -> float:
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        hinted = retry_after_seconds(exc)
+        return max(delay, hinted) if hinted is not None else delay
+
+    def _call(self, kwargs, on_attempt, on_retry=None, fallback_model=None):
+        # Runs on a worker thread; on_attempt returns the result or raises.
+        # kwargs is shared with on_attempt, so switching "model" here
+        # changes the model the next attempt asks for.
+        attempt = 0
+        while True:
+            self.request_bucket.acquire()
+            self.token_bucket.acquire(estimate_tokens(kwargs["messages"]))
+            try:
+                return on_attempt()
+            except Exception as exc:
+                if fallback_model and kwargs["model"] != fallback_model and should_fall_back(exc):
+                    kwargs["model"] = fallback_model
+                    self.fallbacks += 1
+                    if on_retry is not None:
+                        on_retry(exc)
+                    continue
+                if attempt >= self.max_retries or not is_retryable(exc):
+                    raise
+                self.retries += 1
+                if on_retry is not None:
+                    on_retry(exc)
+                time.sleep(self._backoff(attempt, exc))
+                attempt += 1
+
+    def _complete(self, kwargs, on_retry, fallback_model):
+        def attempt():
+            completion = self.client.chat.completions.create(**kwargs)
+            usage = getattr(completion, "usage", None)
+            if usage is not None:
+                self.token_bucket.consume(usage.completion_tokens or 0)
+            return completion
+
+        return self._call(kwargs, attempt, on_retry, fallback_model)
+
+    def _stream(self, kwargs, handle: StreamHandle, on_retry, fallback_model):
+        started = False
+
+        def attempt():
+            nonlocal started
+            stream = self.client.chat.completions.create(stream=True, **kwargs)
+            try:
+                for chunk in stream:
+                    if handle.cancelled.is_set():
+                        return
+                    started = True
+                    usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+                    if usage is not None:
+                        self.token_bucket.consume(usage.completion_tokens or 0)
+                    handle.put(chunk)
+            except Exception as exc:
+                # Once text has reached the user a retry would duplicate it.
+                if started:
+                    raise _StreamInterrupted(exc)
+                raise
+            finally:
+                stream.close()
+
+        try:
+            self._call(kwargs, attempt, on_retry, fallback_model)
+            handle.put(_DONE)
+        except _StreamInterrupted as exc:
+            handle.put(exc.cause)
+        except Exception as exc:
+            handle.put(exc)
+
+    def submit(self, on_retry=None, fallback_model=None, **kwargs):
+        """Queue a non-streaming completion; returns a Future.
+
+        With fallback_model, a 429 or timeout switches to that model
+        instead of backing off; completion.model tells which one answered.
+        """
+        return self._pool.submit(self._complete, kwargs, on_retry, fallback_model)
+
+    def complete(self, on_retry=None, fallback_model=None, **kwargs):
+        return self.submit(on_retry, fallback_model, **kwargs).result()
+
+    def stream(self, on_retry=None, fallback_model=None, **kwargs) -> StreamHandle:
+        """Queue a streaming completion; iterate the handle for chunks."""
+        handle = StreamHandle()
+        self._pool.submit(self._stream, kwargs, handle, on_retry, fallback_model)
+        return handle
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,77 @@
+import re
+from collections import deque
+
+from nexo.budget import count_tokens, truncate
+from nexo.plans import as_markdown
+from nexo.prompts import build_followup_messages
+
+HEADING_RE = re.compile(r"^\s*#{1,6}\s+(.*)$")
+ITEM_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*)$")
+PROFILE_LINE_RE = re.compile(r"^([A-Z][\w /()]*):\s*(\S.*)$")
+
+
+def summarize_plan(text: str, max_tokens: int = 250) -> str:
+    """Extractive outline of a markdown answer: each heading and its first items."""
+    lines, items_under_heading = [], 0
+    for raw in text.splitlines():
+        heading = HEADING_RE.match(raw)
+        item = ITEM_RE.match(raw)
+        if heading:
+            lines.append(f"{heading.group(1).strip()}:")
+            items_under_heading = 0
+        elif item and items_under_heading < 2:
+            lines.append(f"- {item.group(1).strip()}")
+            items_under_heading += 1
+    if not lines:
+        lines = [" ".join(text.split())]
+    return truncate("\n".join(lines), max_tokens)
+
+
+def compact_profile(prompt: str) -> str:
+    # The filled-in "Label: value" lines of a form prompt, without the instructions.
+    return "\n".join(
+        line.strip() for line in prompt.splitlines() if PROFILE_LINE_RE.match(line.strip())
+    )
+
+
+class Conversation:
+    """Follow-up thread on one generated plan.
+
+    The model never sees the full plan again: it gets the profile, an
+    outline of the plan, a folded summary of older turns and the last
+    `window` turns in full. Older turns are folded one at a time, so the
+    prompt stays under max_context_tokens however long the thread gets.
+    """
+
+    __slots__ = ("mode", "profile", "plan", "plan_summary", "earlier", "recent", "display",
+                 "window", "max_context_tokens")
+
+    def __init__(self, mode: str, prompt: str, plan: str, window: int = 2, max_context_tokens: int = 900):
+        self.mode = mode
+        self.profile = compact_profile(prompt)
+        self.plan = plan
+        self.plan_summary = summarize_plan(as_markdown(plan))
+        self.earlier = []
+        self.recent = deque()
+        self.display = []
+        self.window = window
+        self.max_context_tokens = max_context_tokens
+
+    def messages(self, delta: str):
+        return build_followup_messages(
+            self.mode, self.profile, self.plan_summary, "\n".join(self.earlier), list(self.recent), delta
+        )
+
+    def context_tokens(self) -> int:
+        return sum(count_tokens(m["content"]) for m in self.messages(""))
+
+    def add_turn(self, delta: str, reply: str):
+        self.display.append((delta, reply))
+        self.recent.append((delta, reply))
+        while self.recent and (len(self.recent) > self.window or self.context_tokens() > self.max_context_tokens):
+            old_delta, old_reply = self.recent.popleft()
+            outline = " ".join(summarize_plan(old_reply, 60).split())
+            self.earlier.append(f"- Asked: {truncate(old_delta, 40)} → {outline}")
+        # The folded summary itself is bounded too: oldest changes go first.
+        while len(self.earlier) > 1 and self.context_tokens() > self.max_context_tokens:
+            self.earlier.pop(0)
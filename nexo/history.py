@@ -0,0 +1,382 @@
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+
+log = logging.getLogger("nexo.history")
+
+PREVIEW_CHARS = 160
+MARKDOWN_NOISE_RE = re.compile(r"[#*_`>|]+|\s+")
+
+
+def make_preview(text: str, limit: int = PREVIEW_CHARS) -> str:
+    flat = MARKDOWN_NOISE_RE.sub(" ", text).strip()
+    return flat if len(flat) <= limit else flat[: limit - 1].rstrip() + "…"
+
+
+@dataclass(slots=True)
+class HistoryEntry:
+    seq: int
+    mode: str
+    timestamp: str
+    summary: str
+    preview: str
+    input_z: bytes
+    output_z: bytes
+
+    @classmethod
+    def create(cls, seq: int, mode: str, timestamp: str, summary: str, input: str, output: str, preview: str = None):
+        return cls(
+            seq, mode, timestamp, summary, make_preview(preview or output),
+            zlib.compress(input.encode("utf-8")),
+            zlib.compress(output.encode("utf-8")),
+        )
+
+    @property
+    def input(self) -> str:
+        return zlib.decompress(self.input_z).decode("utf-8")
+
+    @property
+    def output(self) -> str:
+        return zlib.decompress(self.output_z).decode("utf-8")
+
+
+ENTRY_COLUMNS = "seq, mode, timestamp, summary, preview, input_z, output_z"
+SEARCH_WORD_RE = re.compile(r"\w+")
+
+
+def fts_query(user_token: str, text: str) -> str:
+    # Every word must match (stemmed, so "skill" finds "skills"), within
+    # this user's rows only. Prefix queries are left out: they scan every
+    # matching term and are 10-100x slower at 100k plans.
+    words = " ".join(f'"{word}"' for word in SEARCH_WORD_RE.findall(text))
+    return f'user_token : "{user_token}" AND ({words})' if words else ""
+
+
+class HistoryStore:
+    """Durable history of every user, in one SQLite file (WAL).
+
+    Rows keep the compressed text; a contentless FTS5 index over summary,
+    input and output serves search. write() only enqueues: a background
+    thread commits queued entries in batches, so a submit never waits on
+    disk. Reads call flush() first so they always see queued entries.
+    A batch that fails is written again row by row, so one bad row (or a
+    locked or full disk, retried write_attempts times) costs only itself.
+    """
+
+    def __init__(self, path: str, batch_size: int = 64, flush_interval: float = 0.05,
+                 write_attempts: int = 3, retry_delay: float = 0.5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.write_attempts = write_attempts
+        self.retry_delay = retry_delay
+        self._conn = self._connect(path)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "id INTEGER PRIMARY KEY, user_token TEXT NOT NULL, seq INTEGER NOT NULL, mode TEXT, "
+                "timestamp TEXT, summary TEXT, preview TEXT, input_z BLOB, output_z BLOB, created REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS history_user_seq ON history (user_token, seq)")
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5("
+                "user_token, summary, input, output, content='', tokenize='porter unicode61 remove_diacritics 2')"
+            )
+        self._queue = queue.Queue()
+        self._writer_conn = self._connect(path)
+        threading.Thread(target=self._write_loop, daemon=True, name="nexo-history-writer").start()
+
+    @staticmethod
+    def _connect(path: str):
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def write(self, user_token: str, entry: HistoryEntry):
+        self._queue.put((user_token, entry))
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception:
+                # Never let the writer die: flush() would wait on it forever.
+                log.exception("history writer lost a batch of %d entries", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _insert(self, user_token: str, entry: HistoryEntry):
+        cursor = self._writer_conn.execute(
+            "INSERT INTO history (user_token, seq, mode, timestamp, summary, preview, "
+            "input_z, output_z, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (user_token, entry.seq, entry.mode, entry.timestamp, entry.summary,
+             entry.preview, entry.input_z, entry.output_z, time.time()),
+        )
+        self._writer_conn.execute(
+            "INSERT INTO history_fts (rowid, user_token, summary, input, output) VALUES (?, ?, ?, ?, ?)",
+            (cursor.lastrowid, user_token, entry.summary, entry.input, entry.output),
+        )
+
+    def _write_batch(self, batch):
+        try:
+            with self._writer_conn:
+                for user_token, entry in batch:
+                    self._insert(user_token, entry)
+            return
+        except sqlite3.Error as e:
+            log.warning("history batch of %d failed (%s); writing it row by row", len(batch), e)
+        for user_token, entry in batch:
+            self._write_row(user_token, entry)
+
+    def _write_row(self, user_token: str, entry: HistoryEntry):
+        for attempt in range(self.write_attempts):
+            try:
+                with self._writer_conn:
+                    self._insert(user_token, entry)
+                return
+            except sqlite3.IntegrityError:
+                # Another session of the same user took this seq: keep the
+                # entry under the next free one.
+                (last,) = self._writer_conn.execute(
+                    "SELECT MAX(seq) FROM history WHERE user_token = ?", (user_token,)
+                ).fetchone()
+                entry.seq = (last or 0) + 1
+            except sqlite3.Error as e:
+                log.warning("history write failed (%s), attempt %d/%d", e, attempt + 1, self.write_attempts)
+                time.sleep(self.retry_delay * 2 ** attempt)
+        log.error("dropped history entry seq=%d after %d attempts", entry.seq, self.write_attempts)
+
+    def flush(self):
+        self._queue.join()
+
+    def stats(self, user_token: str):
+        # (entry count, highest seq or -1) for a returning user.
+        self.flush()
+        with self._lock:
+            count, last = self._conn.execute(
+                "SELECT COUNT(*), MAX(seq) FROM history WHERE user_token = ?", (user_token,)
+            ).fetchone()
+        return count, -1 if last is None else last
+
+    def read(self, user_token: str, before_seq: int, limit: int, offset: int = 0):
+        # Newest first, starting just below before_seq.
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {ENTRY_COLUMNS} FROM history "
+                "WHERE user_token = ? AND seq < ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+                (user_token, before_seq, limit, offset),
+            ).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def search(self, user_token: str, text: str, limit: int = 20):
+        query = fts_query(user_token, text)
+        if not query:
+            return []
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join('h.' + c for c in ENTRY_COLUMNS.split(', '))} "
+                "FROM history_fts JOIN history h ON h.id = history_fts.rowid "
+                "WHERE history_fts MATCH ? ORDER BY rank LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def _delete_where(self, where: str, params):
+        # Contentless FTS rows are removed by repeating the indexed values.
+        self.flush()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT id, user_token, summary, input_z, output_z FROM history WHERE {where}", params
+            ).fetchall()
+            self._conn.executemany(
+                "INSERT INTO history_fts (history_fts, rowid, user_token, summary, input, output) "
+                "VALUES ('delete', ?, ?, ?, ?, ?)",
+                [(row_id, user_token, summary, zlib.decompress(input_z).decode("utf-8"),
+                  zlib.decompress(output_z).decode("utf-8"))
+                 for row_id, user_token, summary, input_z, output_z in rows],
+            )
+            self._conn.execute(f"DELETE FROM history WHERE {where}", params)
+
+    def delete(self, user_token: str):
+        self._delete_where("user_token = ?", (user_token,))
+
+    def prune(self, max_age_seconds: float):
+        self._delete_where("created < ?", (time.time() - max_age_seconds,))
+
+
+class RedisHistoryStore:
+    """HistoryStore's interface over Redis, for replicas that share history.
+
+    Per user: a sorted set of seqs and one hash per entry; a global sorted
+    set by creation time serves prune(). Writes go straight out in one
+    pipeline. Search scans the user's entries newest first for entries
+    containing every word, so it ranks by recency rather than relevance.
+    """
+
+    FIELDS = ("mode", "timestamp", "summary", "preview", "input_z", "output_z")
+
+    def __init__(self, client, prefix: str = "nexo:"):
+        self._client = client
+        self._prefix = f"{prefix}history:"
+        self._created = f"{self._prefix}created"
+
+    def _seqs(self, user_token: str) -> str:
+        return f"{self._prefix}{user_token}"
+
+    def _entry(self, user_token: str, seq) -> str:
+        return f"{self._prefix}{user_token}:{int(seq)}"
+
+    def write(self, user_token: str, entry: HistoryEntry):
+        with self._client.pipeline() as pipe:
+            pipe.hset(self._entry(user_token, entry.seq), mapping={f: getattr(entry, f) for f in self.FIELDS})
+            pipe.zadd(self._seqs(user_token), {entry.seq: entry.seq})
+            pipe.zadd(self._created, {f"{user_token}\x1f{entry.seq}": time.time()})
+            pipe.execute()
+
+    def flush(self):
+        pass
+
+    def stats(self, user_token: str):
+        with self._client.pipeline() as pipe:
+            pipe.zcard(self._seqs(user_token))
+            pipe.zrevrange(self._seqs(user_token), 0, 0, withscores=True)
+            count, last = pipe.execute()
+        return count, int(last[0][1]) if last else -1
+
+    def read(self, user_token: str, before_seq: int, limit: int, offset: int = 0):
+        seqs = self._client.zrevrangebyscore(
+            self._seqs(user_token), f"({before_seq}", "-inf", start=offset, num=limit
+        )
+        with self._client.pipeline() as pipe:
+            for seq in seqs:
+                pipe.hmget(self._entry(user_token, seq), self.FIELDS)
+            rows = pipe.execute()
+        return [
+            HistoryEntry(int(seq), mode.decode("utf-8"), timestamp.decode("utf-8"), summary.decode("utf-8"),
+                         preview.decode("utf-8"), input_z, output_z)
+            for seq, (mode, timestamp, summary, preview, input_z, output_z) in zip(seqs, rows)
+            if mode is not None
+        ]
+
+    def search(self, user_token: str, text: str, limit: int = 20):
+        words = [word.lower() for word in SEARCH_WORD_RE.findall(text)]
+        if not words:
+            return []
+        results, before = [], self.stats(user_token)[1] + 1
+        while len(results) < limit:
+            batch = self.read(user_token, before, 100)
+            if not batch:
+                break
+            for entry in batch:
+                haystack = f"{entry.summary}\n{entry.input}\n{entry.output}".lower()
+                if all(word in haystack for word in words):
+                    results.append(entry)
+            before = batch[-1].seq
+        return results[:limit]
+
+    def _remove(self, members):
+        with self._client.pipeline() as pipe:
+            for member in members:
+                user_token, _, seq = member.decode("utf-8").rpartition("\x1f")
+                pipe.delete(self._entry(user_token, seq))
+                pipe.zrem(self._seqs(user_token), seq)
+                pipe.zrem(self._created, member)
+            pipe.execute()
+
+    def delete(self, user_token: str):
+        seqs = self._client.zrange(self._seqs(user_token), 0, -1)
+        self._remove(f"{user_token}\x1f{int(seq)}".encode("utf-8") for seq in seqs)
+        self._client.delete(self._seqs(user_token))
+
+    def prune(self, max_age_seconds: float):
+        self._remove(self._client.zrangebyscore(self._created, "-inf", time.time() - max_age_seconds))
+
+
+class SessionHistory:
+    # One user's history. The newest max_in_memory entries stay in RAM for
+    # the common case; every entry is also queued for the durable store,
+    # which serves older pages, search, and the history of returning users.
+    # Background jobs append from worker threads, hence the lock.
+
+    def __init__(self, user_token: str, store: HistoryStore, max_in_memory: int = 20):
+        self.user_token = user_token
+        self.max_in_memory = max_in_memory
+        self._store = store
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self._count, self._last_seq = store.stats(user_token)
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def append(self, mode: str, timestamp: str, summary: str, input: str, output: str, preview: str = None):
+        # preview: text to shorten for the list view, if not the output itself.
+        with self._lock:
+            # Microsecond seqs keep entries from two tabs of the same user apart.
+            self._last_seq = max(time.time_ns() // 1000, self._last_seq + 1)
+            entry = HistoryEntry.create(self._last_seq, mode, timestamp, summary, input, output, preview)
+            self._store.write(self.user_token, entry)
+            self._count += 1
+            self._recent.append(entry)
+            while len(self._recent) > self.max_in_memory:
+                self._recent.popleft()
+        return entry
+
+    def _snapshot(self):
+        # (in-memory entries newest first, seq the disk pages start below)
+        with self._lock:
+            recent = list(reversed(self._recent))
+            return recent, recent[-1].seq if recent else self._last_seq + 1
+
+    def iter_newest(self, batch_size: int = 20):
+        recent, before = self._snapshot()
+        yield from recent
+        while True:
+            batch = self._store.read(self.user_token, before, batch_size)
+            if not batch:
+                return
+            yield from batch
+            before = batch[-1].seq
+
+    def page(self, page: int, page_size: int):
+        # Newest first; page 0 starts with the in-memory entries.
+        start = page * page_size
+        recent, before = self._snapshot()
+        entries = recent[start : start + page_size]
+        if len(entries) < page_size:
+            entries += self._store.read(
+                self.user_token, before, page_size - len(entries), offset=max(0, start - len(recent))
+            )
+        return entries
+
+    def page_count(self, page_size: int) -> int:
+        return max(1, -(-self._count // page_size))
+
+    def search(self, text: str, limit: int = 20):
+        return self._store.search(self.user_token, text, limit)
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+            self._count = 0
+        self._store.delete(self.user_token)
@@ -0,0 +1,111 @@
+import logging
+import queue
+import threading
+import time
+import uuid
+
+from nexo.singleflight import Flight
+
+log = logging.getLogger("nexo.jobs")
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+class Job:
+    # One queued generation. Its text is published to a Flight as it
+    # streams, so any later rerun can replay what is there and follow along.
+
+    def __init__(self, produce, on_done=None, job_id: str = None):
+        self.id = job_id or new_job_id()
+        self.status = "queued"
+        self.progress = Flight()
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._produce = produce
+        self._on_done = on_done
+
+    @property
+    def done(self) -> bool:
+        return self.finished is not None
+
+
+class JobQueue:
+    """Process-wide worker pool draining a bounded queue of generations.
+
+    A job does not belong to the script run that submitted it: when the
+    user clicks something else mid-answer, the rerun stops watching but the
+    job keeps going. on_done(job) runs on the worker before waiters are
+    woken, so results are stored (e.g. in history) wherever the user is.
+    Finished jobs are kept for keep_seconds so a later rerun can pick them up.
+    """
+
+    def __init__(self, workers: int = 8, max_queued: int = 64, keep_seconds: float = 900.0):
+        self.keep_seconds = keep_seconds
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        for i in range(workers):
+            threading.Thread(target=self._work, daemon=True, name=f"nexo-job-{i}").start()
+
+    def submit(self, produce, on_done=None, job_id: str = None) -> Job:
+        """Queue produce(), a callable returning an iterator of text chunks.
+
+        Pass job_id (e.g. from new_job_id()) when on_done needs to recognise
+        the job before submit() has returned. Raises JobQueueFull instead of
+        waiting when max_queued jobs are pending.
+        """
+        job = Job(produce, on_done, job_id)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise JobQueueFull(f"{self._queue.maxsize} jobs already waiting") from None
+        return job
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _prune(self):
+        cutoff = time.time() - self.keep_seconds
+        for job_id in [j.id for j in self._jobs.values() if j.done and j.finished < cutoff]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            job.status, job.started = "running", time.time()
+            parts = []
+            try:
+                for chunk in job._produce():
+                    parts.append(chunk)
+                    job.progress.publish(chunk)
+                job.result = "".join(parts)
+            except Exception as exc:
+                job.error = exc
+            if job._on_done is not None:
+                try:
+                    job._on_done(job)
+                except Exception:
+                    log.exception("on_done failed for job %s", job.id)
+            # Only now is the job done, so whoever sees that also sees on_done's effects.
+            job.status = "failed" if job.error is not None else "done"
+            job.finished = time.time()
+            job.progress.finish(job.error)
+            self._queue.task_done()
@@ -0,0 +1,157 @@
+import bisect
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+TRACKS = ("Web", "Data/ML", "Cloud", "Aptitude")
+TERM_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+# Index weights: a title match ranks above a topic match, which ranks above a tag.
+FIELD_WEIGHTS = (("title", 3), ("topic", 2), ("tags", 1))
+# Tags that describe the kind of resource, not what it teaches; never used to link plans.
+GENERIC_TAGS = frozenset({"docs", "course", "practice", "roadmap", "programming", "projects", "interview"})
+MAX_PHRASE_WORDS = 3
+
+
+def terms(text: str):
+    # Lowercased words with a plain plural strip, so "containers" finds "container".
+    return [
+        t[:-1] if len(t) > 3 and t.endswith("s") and not t.endswith("ss") else t
+        for t in TERM_RE.findall(text.lower())
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class Resource:
+    id: int
+    title: str
+    url: str
+    track: str
+    topic: str
+    tags: tuple
+
+    def markdown(self) -> str:
+        return f"[{self.title}]({self.url})"
+
+
+class ResourceLibrary:
+    """Curated learning resources with an inverted index over title, topic and tags.
+
+    Everything is built once when the catalogue is loaded; a search is a
+    few dict lookups and intersections, and the last query word also
+    matches as a prefix so results update while the user is typing.
+    """
+
+    def __init__(self, resources):
+        self.resources = [
+            Resource(i, r["title"], r["url"], r["track"], r.get("topic", ""), tuple(r.get("tags", ())))
+            for i, r in enumerate(resources)
+        ]
+        unknown = {r.track for r in self.resources} - set(TRACKS)
+        if unknown:
+            raise ValueError(f"Unknown library tracks: {', '.join(sorted(unknown))}")
+        self._postings = {}  # term -> {resource id: weight}
+        self._by_track = {track: frozenset() for track in TRACKS}
+        self._phrases = {}  # topic/tag words -> ((resource id, weight), ...)
+        self._build()
+        self._terms = sorted(self._postings)
+        # Reruns and page changes repeat the same query; plans are re-shown on every rerun.
+        self._match = lru_cache(maxsize=512)(self._match_uncached)
+        self._link = lru_cache(maxsize=128)(self._link_uncached)
+
+    @classmethod
+    def from_json(cls, path: str):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["resources"])
+
+    def _build(self):
+        by_track, phrases = {}, {}
+        for r in self.resources:
+            by_track.setdefault(r.track, set()).add(r.id)
+            for field, weight in FIELD_WEIGHTS:
+                values = r.tags if field == "tags" else (getattr(r, field),)
+                for value in values:
+                    for term in terms(value):
+                        postings = self._postings.setdefault(term, {})
+                        postings[r.id] = max(postings.get(r.id, 0), weight)
+            linked = [(r.topic, 2)] + [(tag, 1) for tag in r.tags if tag not in GENERIC_TAGS]
+            for value, weight in linked:
+                words = tuple(terms(value))
+                if words and len(words) <= MAX_PHRASE_WORDS:
+                    phrases.setdefault(words, {})
+                    phrases[words][r.id] = max(phrases[words].get(r.id, 0), weight)
+        self._by_track.update({track: frozenset(ids) for track, ids in by_track.items()})
+        self._phrases = {words: tuple(ids.items()) for words, ids in phrases.items()}
+
+    def __len__(self):
+        return len(self.resources)
+
+    def track_counts(self):
+        return {track: len(ids) for track, ids in self._by_track.items()}
+
+    def _prefix_postings(self, prefix: str):
+        postings = {}
+        start = bisect.bisect_left(self._terms, prefix)
+        for term in self._terms[start:]:
+            if not term.startswith(prefix):
+                break
+            for rid, weight in self._postings[term].items():
+                postings[rid] = max(postings.get(rid, 0), weight)
+        return postings
+
+    def _match_uncached(self, query: str, track: str):
+        # Resource ids for a normalized query, best first.
+        words = terms(query)
+        allowed = self._by_track.get(track) if track else None
+        if not words:
+            ids = range(len(self.resources)) if allowed is None else sorted(allowed)
+            return tuple(ids)
+        scores = None
+        for i, word in enumerate(words):
+            postings = self._prefix_postings(word) if i == len(words) - 1 else self._postings.get(word, {})
+            if scores is None:
+                scores = dict(postings)
+            else:
+                scores = {rid: score + postings[rid] for rid, score in scores.items() if rid in postings}
+            if not scores:
+                return ()
+        if allowed is not None:
+            scores = {rid: score for rid, score in scores.items() if rid in allowed}
+        return tuple(sorted(scores, key=lambda rid: (-scores[rid], rid)))
+
+    def search(self, query: str = "", track: str = None, page: int = 0, page_size: int = 20):
+        """Return (resources on this page, total matches). Every query word must match."""
+        ids = self._match(" ".join(query.lower().split()), track or None)
+        start = page * page_size
+        return [self.resources[rid] for rid in ids[start : start + page_size]], len(ids)
+
+    def link(self, text: str, limit: int = 6):
+        """Resources whose topic or tags are mentioned in text, e.g. a generated plan.
+
+        Matching is local phrase lookup over the text's words; at most one
+        resource per topic so one heavily mentioned skill doesn't fill the list.
+        """
+        return self._link(text, limit)
+
+    def _link_uncached(self, text: str, limit: int):
+        words = terms(text)
+        mentions = Counter()
+        for start in range(len(words)):
+            for size in range(1, MAX_PHRASE_WORDS + 1):
+                phrase = tuple(words[start : start + size])
+                if phrase in self._phrases:
+                    mentions[phrase] += 1
+        scores = Counter()
+        for phrase, count in mentions.items():
+            for rid, weight in self._phrases[phrase]:
+                scores[rid] += weight * count
+        linked, topics = [], set()
+        for rid, _ in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+            resource = self.resources[rid]
+            if resource.topic not in topics:
+                topics.add(resource.topic)
+                linked.append(resource)
+                if len(linked) == limit:
+                    break
+        return linked
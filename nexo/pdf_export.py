@@ -0,0 +1,215 @@
+import re
+from functools import lru_cache
+
+from fpdf import FPDF
+from fpdf.fonts import CORE_FONTS_CHARWIDTHS
+
+# fpdf2's multi_cell() re-measures text character by character and gets
+# slow on long exports, so plans are laid out here once (cached per
+# markdown string) and drawn with plain text() calls.
+
+PAGE_WIDTH = 210.0
+PAGE_HEIGHT = 297.0
+MARGIN = 15.0
+TEXT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+BOTTOM = PAGE_HEIGHT - MARGIN - 6.0
+PT_TO_MM = 25.4 / 72
+
+FONT = "helvetica"
+MONO = "courier"
+# (font size in pt, line height in mm, space before in mm)
+STYLES = {
+    "title": (17.0, 8.0, 0.0),
+    "h1": (15.0, 7.5, 4.0),
+    "h2": (13.0, 6.8, 3.5),
+    "h3": (11.5, 6.2, 3.0),
+    "body": (10.5, 5.2, 1.2),
+    "code": (9.0, 4.6, 0.6),
+}
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+BULLET_RE = re.compile(r"^(\s*)[-*+]\s+(.*)$")
+NUMBERED_RE = re.compile(r"^(\s*)(\d+[.)])\s+(.*)$")
+RULE_RE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+TABLE_SEPARATOR_RE = re.compile(r"^\s*\|?[\s:|-]+\|[\s:|-]*$")
+LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+TAG_RE = re.compile(r"<[^>]+>")
+
+REPLACEMENTS = str.maketrans({
+    "–": "-", "—": "-", "‘": "'", "’": "'", "“": '"', "”": '"', "•": "·",
+    "…": "...", "→": "->", "←": "<-", "✅": "[x]", "❌": "[ ]", "≈": "~", "≤": "<=", "≥": ">=",
+    " ": " ",
+})
+
+
+def latin1(text: str) -> str:
+    # Core PDF fonts only cover Latin-1; anything else (emoji etc.) is dropped.
+    return text.translate(REPLACEMENTS).encode("latin-1", "ignore").decode("latin-1")
+
+
+@lru_cache(maxsize=4096)
+def text_width(text: str, bold: bool, size: float, mono: bool = False) -> float:
+    if mono:
+        return len(text) * 600 * size / 1000 * PT_TO_MM
+    widths = CORE_FONTS_CHARWIDTHS[FONT + ("B" if bold else "")]
+    return sum(widths.get(ch, 500) for ch in text) * size / 1000 * PT_TO_MM
+
+
+def inline_runs(text: str, bold: bool = False):
+    # Splits "**bold** and normal" into [(bold, word), ...].
+    text = TAG_RE.sub(" ", LINK_RE.sub(r"\1", text)).replace("`", "")
+    words = []
+    for i, part in enumerate(text.split("**")):
+        part_bold = bold or i % 2 == 1
+        for word in part.replace("__", "").split():
+            words.append((part_bold, latin1(word)))
+    return [(b, w) for b, w in words if w]
+
+
+def wrap(words, size: float, width: float):
+    lines, line, used = [], [], 0.0
+    space = text_width(" ", False, size)
+    for bold, word in words:
+        w = text_width(word, bold, size)
+        if line and used + space + w > width:
+            lines.append(line)
+            line, used = [], 0.0
+        line.append((bold, word))
+        used += (space if len(line) > 1 else 0.0) + w
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _block_lines(style, words, indent=0.0, prefix=None):
+    size, height, before = STYLES[style]
+    out = []
+    for i, line in enumerate(wrap(words, size, TEXT_WIDTH - indent - (5.0 if prefix else 0.0))):
+        out.append((before if i == 0 else 0.0, height, size, indent, prefix if i == 0 else None, False, tuple(line)))
+    return out
+
+
+@lru_cache(maxsize=512)
+def layout_markdown(text: str):
+    """Parse markdown once into positioned lines.
+
+    Each line is (space_before, height, size, indent, prefix, mono, runs)
+    where runs is a tuple of (bold, word).
+    """
+    lines = []
+    paragraph = []
+    in_code = False
+
+    def flush():
+        if paragraph:
+            lines.extend(_block_lines("body", inline_runs(" ".join(paragraph))))
+            paragraph.clear()
+
+    for raw in text.splitlines():
+        if raw.strip().startswith("```"):
+            flush()
+            in_code = not in_code
+            continue
+        if in_code:
+            size, height, before = STYLES["code"]
+            chunk = latin1(raw.rstrip()) or " "
+            per_line = max(1, int(TEXT_WIDTH / text_width("M", False, size, mono=True)))
+            for start in range(0, len(chunk), per_line):
+                lines.append((before, height, size, 4.0, None, True, ((False, chunk[start:start + per_line]),)))
+            continue
+        if not raw.strip():
+            flush()
+            continue
+        if TABLE_SEPARATOR_RE.match(raw) and "-" in raw:
+            continue
+
+        heading = HEADING_RE.match(raw)
+        bullet = BULLET_RE.match(raw)
+        numbered = NUMBERED_RE.match(raw)
+        if heading:
+            flush()
+            level = min(len(heading.group(1)), 3)
+            lines.extend(_block_lines(f"h{level}", inline_runs(heading.group(2), bold=True)))
+        elif RULE_RE.match(raw):
+            flush()
+            lines.append((2.0, 3.0, 0.0, 0.0, "rule", False, ()))
+        elif bullet:
+            flush()
+            indent = 4.0 + 4.0 * (len(bullet.group(1).expandtabs(4)) // 2)
+            lines.extend(_block_lines("body", inline_runs(bullet.group(2)), indent, "·"))
+        elif numbered:
+            flush()
+            indent = 4.0 + 4.0 * (len(numbered.group(1).expandtabs(4)) // 2)
+            lines.extend(_block_lines("body", inline_runs(numbered.group(3)), indent, numbered.group(2)))
+        elif raw.lstrip().startswith("|"):
+            flush()
+            cells = [cell.strip() for cell in raw.strip().strip("|").split("|")]
+            lines.extend(_block_lines("body", inline_runs("  |  ".join(cells))))
+        else:
+            paragraph.append(raw.strip().lstrip(">").strip())
+    flush()
+    return tuple(lines)
+
+
+class PlanPDF(FPDF):
+    def footer(self):
+        self.set_y(-12)
+        self.set_font(FONT, "", 8)
+        self.set_text_color(120, 120, 120)
+        self.cell(0, 5, f"Nexo AI Career  ·  page {self.page_no()}", align="C")
+        self.set_text_color(0, 0, 0)
+
+
+def new_document():
+    pdf = PlanPDF(format="A4", unit="mm")
+    pdf.set_margins(MARGIN, MARGIN, MARGIN)
+    pdf.set_auto_page_break(False)
+    pdf.set_title("Nexo AI career plans")
+    pdf.set_author("Nexo AI")
+    return pdf
+
+
+def _draw(pdf, lines, y):
+    for before, height, size, indent, prefix, mono, runs in lines:
+        if y + before + height > BOTTOM:
+            pdf.add_page()
+            y = MARGIN
+        else:
+            y += before
+        if prefix == "rule":
+            pdf.set_draw_color(180, 180, 180)
+            pdf.line(MARGIN, y + height / 2, PAGE_WIDTH - MARGIN, y + height / 2)
+            y += height
+            continue
+        baseline = y + height * 0.75
+        x = MARGIN + indent
+        if prefix:
+            pdf.set_font(FONT, "", size)
+            pdf.text(x, baseline, latin1(prefix))
+            x += 5.0
+        current = None
+        for i, (bold, word) in enumerate(runs):
+            style = (MONO if mono else FONT, "B" if bold else "")
+            if style != current:
+                pdf.set_font(style[0], style[1], size)
+                current = style
+            if i:
+                x += text_width(" ", False, size, mono)
+            pdf.text(x, baseline, word)
+            x += text_width(word, bold, size, mono)
+        y += height
+    return y
+
+
+def render_pdf(documents) -> bytes:
+    """documents: iterable of (title, subtitle, markdown); one or more pages each."""
+    pdf = new_document()
+    for title, subtitle, markdown in documents:
+        pdf.add_page()
+        y = _draw(pdf, _block_lines("title", inline_runs(title, bold=True)), MARGIN)
+        if subtitle:
+            pdf.set_text_color(90, 90, 90)
+            y = _draw(pdf, _block_lines("body", inline_runs(subtitle)), y)
+            pdf.set_text_color(0, 0, 0)
+        _draw(pdf, layout_markdown(markdown), y + 2.0)
+    return bytes(pdf.output())
@@ -0,0 +1,206 @@
+import hashlib
+import html
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+from nexo.theme import PRIORITY_COLORS
+
+PHASE_WINDOWS = ("0–3 months", "3–12 months", "12–36 months")
+PRIORITIES = ("high", "medium", "low")
+# Stored plans start with this, so history and caches can tell them from markdown answers.
+PLAN_PREFIX = '{"plan":1,'
+FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+class PlanError(ValueError):
+    pass
+
+
+def loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def dumps(value) -> str:
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _text(value, what: str) -> str:
+    if not isinstance(value, str) or not value.strip():
+        raise PlanError(f"{what} must be a non-empty string")
+    return " ".join(value.split())
+
+
+def _list(value, what: str):
+    if not isinstance(value, list):
+        raise PlanError(f"{what} must be a list")
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Phase:
+    window: str
+    focus: str
+    steps: tuple
+    # (name, priority) pairs, highest priority first.
+    topics: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Plan:
+    """A validated structured plan: three phases and sample questions.
+
+    to_json() is the compact form kept in caches and history; it is also
+    what the plan id is computed from.
+    """
+
+    summary: str
+    phases: tuple
+    # (question, answer outline) pairs.
+    questions: tuple
+
+    def to_json(self) -> str:
+        return dumps({
+            "plan": 1,
+            "summary": self.summary,
+            "phases": [
+                {"window": p.window, "focus": p.focus, "steps": list(p.steps),
+                 "topics": [{"name": n, "priority": pr} for n, pr in p.topics]}
+                for p in self.phases
+            ],
+            "questions": [{"question": q, "answer": a} for q, a in self.questions],
+        })
+
+    def markdown(self) -> str:
+        lines = [self.summary]
+        for phase in self.phases:
+            lines += ["", f"### {phase.window}: {phase.focus}"]
+            lines += [f"- {step}" for step in phase.steps]
+            if phase.topics:
+                lines.append("- Topics: " + ", ".join(f"{name} ({priority})" for name, priority in phase.topics))
+        if self.questions:
+            lines += ["", "### Sample questions"]
+            lines += [f"{i}. **{q}** {a}" for i, (q, a) in enumerate(self.questions, start=1)]
+        return "\n".join(lines)
+
+
+def parse_plan(text: str) -> Plan:
+    """Validate a model answer (or a stored plan) against the plan schema.
+
+    Raises PlanError when it is not JSON or doesn't have the expected shape.
+    """
+    text = FENCE_RE.sub("", text)
+    try:
+        data = loads(text)
+    except ValueError as exc:
+        raise PlanError(f"not valid JSON ({exc})") from None
+    if not isinstance(data, dict):
+        raise PlanError("plan must be a JSON object")
+    raw_phases = _list(data.get("phases"), "phases")
+    if len(raw_phases) != len(PHASE_WINDOWS):
+        raise PlanError(f"expected {len(PHASE_WINDOWS)} phases, got {len(raw_phases)}")
+    phases = []
+    for window, raw in zip(PHASE_WINDOWS, raw_phases):
+        if not isinstance(raw, dict):
+            raise PlanError(f"phase {window} must be an object")
+        topics = []
+        for topic in _list(raw.get("topics", []), f"{window} topics"):
+            if not isinstance(topic, dict):
+                raise PlanError(f"{window} topics must be objects")
+            priority = str(topic.get("priority", "")).strip().lower()
+            if priority not in PRIORITIES:
+                raise PlanError(f"topic priority must be one of {', '.join(PRIORITIES)}")
+            topics.append((_text(topic.get("name"), "topic name"), priority))
+        topics.sort(key=lambda topic: PRIORITIES.index(topic[1]))
+        phases.append(Phase(
+            window,
+            _text(raw.get("focus"), f"{window} focus"),
+            tuple(_text(step, f"{window} step") for step in _list(raw.get("steps"), f"{window} steps")),
+            tuple(topics),
+        ))
+    questions = []
+    for item in _list(data.get("questions", []), "questions"):
+        if not isinstance(item, dict):
+            raise PlanError("questions must be objects")
+        questions.append((_text(item.get("question"), "question"), _text(item.get("answer"), "answer outline")))
+    return Plan(_text(data.get("summary"), "summary"), tuple(phases), tuple(questions))
+
+
+def is_plan(text: str) -> bool:
+    return text.startswith(PLAN_PREFIX)
+
+
+def plan_id(stored: str) -> str:
+    return hashlib.blake2b(stored.encode("utf-8"), digest_size=8).hexdigest()
+
+
+@lru_cache(maxsize=256)
+def as_markdown(answer: str) -> str:
+    # Follow-ups, resource links and PDF export work on markdown either way.
+    return parse_plan(answer).markdown() if is_plan(answer) else answer
+
+
+def plan_html(plan: Plan, theme: str) -> str:
+    colors = PRIORITY_COLORS.get(theme, PRIORITY_COLORS["dark"])
+    esc = html.escape
+    parts = [f"<div class='ai-response nexo-plan'><p class='plan-summary'>{esc(plan.summary)}</p>"]
+    for phase in plan.phases:
+        parts.append(f"<div class='plan-phase'><h4>{esc(phase.window)} · {esc(phase.focus)}</h4><ul>")
+        parts += [f"<li>{esc(step)}</li>" for step in phase.steps]
+        parts.append("</ul>")
+        if phase.topics:
+            parts.append("<div class='plan-topics'>")
+            parts += [
+                f"<span class='plan-topic' style='border-color:{colors[priority]};color:{colors[priority]}'>"
+                f"{esc(name)} · {priority}</span>"
+                for name, priority in phase.topics
+            ]
+            parts.append("</div>")
+        parts.append("</div>")
+    if plan.questions:
+        parts.append("<h4>Sample questions</h4><ol class='plan-questions'>")
+        parts += [f"<li><b>{esc(q)}</b><br>{esc(a)}</li>" for q, a in plan.questions]
+        parts.append("</ol>")
+    parts.append("</div>")
+    return "".join(parts)
+
+
+class PlanRenderer:
+    # Process-wide LRU of rendered plan HTML keyed by (plan id, theme).
+    # The id is a hash of the stored JSON, so a hit skips parsing too.
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._html = OrderedDict()
+        self._lock = threading.Lock()
+
+    def html(self, stored: str, theme: str) -> str:
+        key = (plan_id(stored), theme)
+        with self._lock:
+            cached = self._html.get(key)
+            if cached is not None:
+                self._html.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        rendered = plan_html(parse_plan(stored), theme)
+        with self._lock:
+            self._html[key] = rendered
+            while len(self._html) > self.max_entries:
+                self._html.popitem(last=False)
+        return rendered
+
+    def __len__(self):
+        return len(self._html)
@@ -0,0 +1,236 @@
+"""Ready-made answers for the most common profiles.
+
+    GROQ_API_KEY=... python -m nexo.precomputed data/precomputed.db [--matrix matrix.json]
+
+Generates one answer per (education, target role, company type, mode) in
+the matrix and stores it zlib-compressed in SQLite. Career Direction
+ignores the company axis. Rerunning only fills in missing combinations,
+so the matrix can grow over time. The matrix file is JSON with the keys
+of DEFAULT_MATRIX.
+
+The app opens the file read-only and memory-mapped, so answers are paged
+in on access; only the small profile columns are read into memory, the
+first time a mode is looked up.
+"""
+import argparse
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from nexo.cache import normalize_prompt
+from nexo.engine import DEFAULT_MODEL, RequestEngine
+from nexo.prompts import build_career_prompt, build_interview_prompt, build_messages
+from nexo.semantic import HashingEmbedder, VectorIndex
+
+DEFAULT_MATRIX = {
+    "education": [
+        "B.Tech CSE, final year",
+        "B.Tech IT, 3rd year",
+        "BCA, final year",
+        "MCA",
+        "B.Sc Computer Science",
+        "Fresher, graduated",
+    ],
+    "roles": [
+        "SDE-1",
+        "Data Analyst",
+        "Data Scientist",
+        "ML Engineer",
+        "Frontend Developer",
+        "DevOps Engineer",
+    ],
+    "companies": [
+        "Product company",
+        "TCS NQT",
+        "Infosys / Wipro / service company",
+        "Startup",
+    ],
+    "modes": ["career_direction", "interview_prep"],
+}
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS precomputed ("
+    "id INTEGER PRIMARY KEY, mode TEXT NOT NULL, education TEXT NOT NULL, role TEXT NOT NULL, "
+    "company TEXT NOT NULL, profile_key TEXT NOT NULL, model TEXT NOT NULL, created REAL NOT NULL, "
+    "answer_z BLOB NOT NULL)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS precomputed_profile ON precomputed (mode, profile_key)",
+)
+
+
+def profile_key(education: str, role: str, company: str) -> str:
+    return "\x1f".join(normalize_prompt(value) for value in (education, role, company))
+
+
+def profile_prompt(mode: str, education: str, role: str, company: str) -> str:
+    if mode == "interview_prep":
+        return build_interview_prompt(role=role, company=company, experience=education)
+    return build_career_prompt(education=education, target_roles=role)
+
+
+def matrix_profiles(matrix):
+    for mode in matrix["modes"]:
+        companies = matrix["companies"] if mode == "interview_prep" else [""]
+        for education, role, company in itertools.product(matrix["education"], matrix["roles"], companies):
+            yield mode, education, role, company
+
+
+@dataclass(slots=True)
+class PrecomputedAnswer:
+    score: float
+    education: str
+    role: str
+    company: str
+    answer: str
+
+
+class PrecomputedStore:
+    # Read-only view of the precompute output, shared by every session.
+
+    def __init__(self, path: str, threshold: float = 0.8, role_threshold: float = 0.8,
+                 mmap_bytes: int = 256 * 1024 * 1024):
+        self.threshold = threshold
+        # Checked on its own so "Backend developer" never gets a Frontend plan.
+        self.role_threshold = role_threshold
+        self.embedder = HashingEmbedder()
+        self.hits = 0
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._conn.execute(f"PRAGMA mmap_size = {int(mmap_bytes)}")
+        self._lock = threading.Lock()
+        self._modes = {}
+
+    def _profiles(self, mode: str):
+        # (exact key -> id, index over whole profiles, id -> role vector),
+        # built on first use per mode.
+        with self._lock:
+            if mode not in self._modes:
+                rows = self._conn.execute(
+                    "SELECT id, education, role, company, profile_key FROM precomputed WHERE mode = ?", (mode,)
+                ).fetchall()
+                index = VectorIndex(self.embedder.dim, max(1, len(rows)))
+                roles = {}
+                for row_id, education, role, company, _ in rows:
+                    index.add(self.embedder.embed(f"{education} {role} {company}"), row_id)
+                    roles[row_id] = self.embedder.embed(role)
+                self._modes[mode] = ({row[4]: row[0] for row in rows}, index, roles)
+            return self._modes[mode]
+
+    def _answer(self, row_id: int, score: float):
+        with self._lock:
+            education, role, company, answer_z = self._conn.execute(
+                "SELECT education, role, company, answer_z FROM precomputed WHERE id = ?", (row_id,)
+            ).fetchone()
+        self.hits += 1
+        return PrecomputedAnswer(score, education, role, company, zlib.decompress(answer_z).decode("utf-8"))
+
+    def lookup(self, mode: str, education: str, role: str, company: str = "", threshold: float = None):
+        """Exact profile match, else the nearest one above threshold, else None.
+
+        threshold overrides the store's own, e.g. for a looser fallback match.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        if not role.strip():
+            return None
+        exact, index, roles = self._profiles(mode)
+        row_id = exact.get(profile_key(education, role, company))
+        if row_id is not None:
+            return self._answer(row_id, 1.0)
+        role_vector = self.embedder.embed(role)
+        for score, row_id in index.search(self.embedder.embed(f"{education} {role} {company}"), k=5):
+            if score < threshold:
+                break
+            if float(roles[row_id] @ role_vector) >= self.role_threshold:
+                return self._answer(row_id, score)
+        return None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM precomputed").fetchone()[0]
+
+
+def run_precompute(matrix, path: str, engine: RequestEngine, model: str = DEFAULT_MODEL,
+                   temperature: float = 0.6, concurrency: int = 4):
+    """Yield (mode, education, role, company, error) as each missing profile is stored."""
+    conn = sqlite3.connect(path)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    done = {(mode, key) for mode, key in conn.execute("SELECT mode, profile_key FROM precomputed")}
+    pending = [p for p in matrix_profiles(matrix) if (p[0], profile_key(*p[1:])) not in done]
+
+    def generate(mode, education, role, company):
+        completion = engine.complete(
+            model=model,
+            messages=build_messages(profile_prompt(mode, education, role, company), mode),
+            temperature=temperature,
+            max_tokens=2048,
+        )
+        return completion.choices[0].message.content
+
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="nexo-precompute")
+    try:
+        futures = {pool.submit(generate, *profile): profile for profile in pending}
+        for future in as_completed(futures):
+            mode, education, role, company = futures[future]
+            try:
+                answer = future.result()
+            except Exception as e:
+                yield mode, education, role, company, str(e)
+                continue
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO precomputed "
+                    "(mode, education, role, company, profile_key, model, created, answer_z) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (mode, education, role, company, profile_key(education, role, company), model,
+                     time.time(), zlib.compress(answer.encode("utf-8"), 9)),
+                )
+            yield mode, education, role, company, None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="SQLite file answers are stored in")
+    parser.add_argument("--matrix", help="JSON file with education, roles, companies and modes lists")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests-per-minute", type=float, default=30)
+    parser.add_argument("--tokens-per-minute", type=float, default=8000)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--temperature", type=float, default=0.6)
+    args = parser.parse_args(argv)
+
+    from groq import Groq
+
+    matrix = dict(DEFAULT_MATRIX)
+    if args.matrix:
+        with open(args.matrix, encoding="utf-8") as f:
+            matrix.update(json.load(f))
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    engine = RequestEngine(
+        Groq(api_key=os.environ["GROQ_API_KEY"], max_retries=0),
+        max_in_flight=args.concurrency,
+        requests_per_minute=args.requests_per_minute,
+        tokens_per_minute=args.tokens_per_minute,
+    )
+    print(f"{sum(1 for _ in matrix_profiles(matrix))} profiles in the matrix", file=sys.stderr)
+    failed = 0
+    for i, (mode, education, role, company, error) in enumerate(
+        run_precompute(matrix, args.output, engine, args.model, args.temperature, args.concurrency), start=1
+    ):
+        failed += error is not None
+        status = f"error: {error}" if error else "ok"
+        print(f"[{i}] {mode} | {education} | {role} | {company} {status}", file=sys.stderr)
+    engine.shutdown()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
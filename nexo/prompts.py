@@ -0,0 +1,166 @@
+from nexo.budget import count_tokens
+
+# Every prompt is laid out fixed text first (persona, answer format, the
+# mode's task) and the user's fields last, so consecutive requests share a
+# long identical prefix the provider can cache. Change any of this text
+# and bump the template's version: versions key the response caches and
+# label the token and latency metrics, so old and new can be compared.
+
+PERSONA = """
+You are Nexo AI, an AI Career Guidance Assistant.
+You:
+- Give clear, structured and practical career guidance.
+- Focus on short-term (0–3 months), mid-term (3–12 months) and long-term (1–3 years) actions.
+- Understand student/fresher tech profiles (CSE, IT, etc.) very well.
+- Can also help with interview prep: topics, strategy, and sample questions.
+Keep language simple, supportive and specific.
+"""
+
+MARKDOWN_FORMAT = """
+Return clean markdown with headings and bullet points.
+"""
+
+PLAN_INSTRUCTIONS = """
+Instead of markdown, answer with one JSON object and nothing else:
+{"summary": "<2-3 sentences>",
+ "phases": [{"focus": "<theme of the phase>", "steps": ["<action>", ...],
+             "topics": [{"name": "<topic>", "priority": "high|medium|low"}, ...]}, ...],
+ "questions": [{"question": "<sample interview question>", "answer": "<short answer outline>"}, ...]}
+"phases" has exactly three entries, in order: 0–3 months, 3–12 months, 12–36 months.
+Give 3-6 steps and 3-6 topics per phase and 5-10 questions.
+"""
+
+CAREER_TASK = """
+Task: the user message is a student's profile. Create a step-by-step career direction plan for it.
+"""
+
+INTERVIEW_TASK = """
+Task: the user message describes an upcoming interview. Create:
+1) Topics to revise (with priority),
+2) Daily/weekly plan till interview,
+3) Behavioural questions and how to answer,
+4) 8–10 sample technical questions with short answer outlines.
+"""
+
+FOLLOWUP_INSTRUCTIONS = """
+The user already has the plan outlined below and wants to change part of it.
+Answer only with what changes: updated steps, timelines or topics, in short markdown.
+Do not repeat parts of the plan that stay the same.
+"""
+
+CAREER_FIELDS = ("name", "education", "skills", "interests", "target_roles", "notes")
+
+
+class PromptTemplate:
+    """A versioned prompt for one mode, compiled once at import.
+
+    The system message (persona, answer format, task) is identical for
+    every request of the mode; render() produces the user message from the
+    form fields, leaving out empty ones.
+    """
+
+    __slots__ = ("mode", "version", "key", "_systems", "_lines", "system_tokens")
+
+    def __init__(self, mode: str, version: int, task: str, fields):
+        self.mode = mode
+        self.version = version
+        self.key = f"{mode}/v{version}"
+        self._systems = {False: PERSONA + MARKDOWN_FORMAT + task, True: PERSONA + PLAN_INSTRUCTIONS + task}
+        self._lines = tuple((name, f"{label}: ") for name, label in fields)
+        self.system_tokens = {structured: count_tokens(text) for structured, text in self._systems.items()}
+
+    def variant(self, structured: bool = False) -> str:
+        # Cache group and metric label: the version plus the answer format.
+        return f"{self.key}+plan" if structured else self.key
+
+    def render(self, **values) -> str:
+        return "\n".join(
+            prefix + " ".join(values[name].split())
+            for name, prefix in self._lines
+            if values.get(name, "").strip()
+        )
+
+    def messages(self, user_message: str, structured: bool = False):
+        return [
+            {"role": "system", "content": self._systems[structured]},
+            {"role": "user", "content": user_message},
+        ]
+
+
+TEMPLATES = {
+    template.mode: template
+    for template in (
+        # v2: no Name line. Cached plans are served to other students with
+        # the same profile, so a plan must never be addressed to anyone.
+        PromptTemplate("career_direction", 2, CAREER_TASK, (
+            ("education", "Education"), ("skills", "Skills"), ("interests", "Interests"),
+            ("target_roles", "Target roles"), ("notes", "Extra info"),
+        )),
+        PromptTemplate("interview_prep", 1, INTERVIEW_TASK, (
+            ("role", "Target role"), ("company", "Company / type"), ("experience", "Experience"),
+            ("strong_areas", "Strong areas"), ("weak_areas", "Weak areas"), ("upcoming", "Upcoming"),
+        )),
+    )
+}
+
+FOLLOWUP_VERSION = 1
+FOLLOWUP_KEY = f"followup/v{FOLLOWUP_VERSION}"
+FOLLOWUP_SYSTEM = PERSONA + MARKDOWN_FORMAT + FOLLOWUP_INSTRUCTIONS
+
+
+def template_report():
+    # Fixed prompt tokens per template version, for the Admin page.
+    rows = [
+        {"template": t.variant(structured), "system_tokens": t.system_tokens[structured]}
+        for t in TEMPLATES.values()
+        for structured in (False, True)
+    ]
+    rows.append({"template": FOLLOWUP_KEY, "system_tokens": count_tokens(FOLLOWUP_SYSTEM)})
+    return rows
+
+
+def build_messages(user_message: str, mode: str, structured: bool = False):
+    return TEMPLATES[mode].messages(user_message, structured)
+
+
+def build_followup_messages(mode: str, profile: str, plan_summary: str, earlier: str, recent, delta: str):
+    context = f"Mode: {mode}\n\nProfile:\n{profile}\n\nCurrent plan (outline):\n{plan_summary}"
+    if earlier:
+        context += f"\n\nEarlier changes:\n{earlier}"
+    messages = [
+        {"role": "system", "content": FOLLOWUP_SYSTEM},
+        {"role": "user", "content": context},
+        {"role": "assistant", "content": "Noted. What would you like to change?"},
+    ]
+    for asked, reply in recent:
+        messages.append({"role": "user", "content": asked})
+        messages.append({"role": "assistant", "content": reply})
+    if delta:
+        messages.append({"role": "user", "content": delta})
+    return messages
+
+
+def build_edit_messages(user_message: str, mode: str, base_answer: str, structured: bool = False):
+    # For a profile close to one already answered: adapting that answer
+    # is a small job the fast model does well. The profile stays ahead of
+    # the base answer, which differs on every call anyway.
+    messages = build_messages(user_message, mode, structured)
+    messages[1]["content"] += (
+        "\n\nA plan written for a very similar profile is below. Rewrite it for this profile, "
+        "keeping what still applies and changing what doesn't.\n\n" + base_answer
+    )
+    return messages
+
+
+def build_career_prompt(name="", education="", skills="", interests="", target_roles="", notes=""):
+    # name is accepted (batch rows carry one for their titles) but not sent.
+    return TEMPLATES["career_direction"].render(
+        education=education, skills=skills, interests=interests, target_roles=target_roles, notes=notes
+    )
+
+
+def build_interview_prompt(role="", company="", experience="", strong_areas="", weak_areas="", upcoming=""):
+    return TEMPLATES["interview_prep"].render(
+        role=role, company=company, experience=experience, strong_areas=strong_areas,
+        weak_areas=weak_areas, upcoming=upcoming,
+    )
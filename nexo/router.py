@@ -0,0 +1,109 @@
+import re
+from dataclasses import dataclass, field
+
+from nexo.budget import count_tokens
+from nexo.engine import DEFAULT_MODEL
+from nexo.plans import PlanError, parse_plan
+
+FAST_MODEL = "llama-3.1-8b-instant"
+
+# USD per million (prompt, completion) tokens, Groq list prices.
+PRICES = {
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "openai/gpt-oss-20b": (0.075, 0.30),
+    "openai/gpt-oss-120b": (0.15, 0.60),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+}
+
+# Streamed between a rejected fast draft and the escalated answer;
+# everything before it is discarded by final_answer().
+REDRAFT = "\f"
+
+REFUSAL_RE = re.compile(r"\b(I'?m sorry|I cannot|I can'?t help|as an AI)\b", re.IGNORECASE)
+STRUCTURE_RE = re.compile(r"^\s*(#{1,4} |[-*] |\d+[.)] )", re.MULTILINE)
+# Each mode's answer must contain these, e.g. the 0-3 / 3-12 month phases.
+REQUIRED_RE = {
+    "career_direction": re.compile(r"\bmonths?\b", re.IGNORECASE),
+    "interview_prep": re.compile(r"\?"),
+}
+
+
+def final_answer(text: str) -> str:
+    return text.rpartition(REDRAFT)[2]
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    tier: str
+    model: str
+    fallback: str
+    timeout: float
+    reason: str
+
+
+@dataclass(slots=True)
+class RoutePolicy:
+    fast_model: str = FAST_MODEL
+    large_model: str = DEFAULT_MODEL
+    # Prompts above this many tokens go straight to the large model.
+    fast_max_prompt_tokens: int = 220
+    # Modes that always use the large model.
+    large_modes: tuple = ()
+    fast_timeout: float = 20.0
+    large_timeout: float = 60.0
+    min_answer_tokens: dict = field(default_factory=lambda: {"career_direction": 250, "interview_prep": 250})
+
+
+class ModelRouter:
+    """Pick a model tier per request and decide when a fast draft needs the large model.
+
+    Each route falls back to the other tier's model on 429 or timeout.
+    """
+
+    def __init__(self, policy: RoutePolicy = None):
+        self.policy = policy or RoutePolicy()
+
+    def _route(self, tier: str, reason: str) -> Route:
+        p = self.policy
+        if tier == "fast":
+            return Route("fast", p.fast_model, p.large_model, p.fast_timeout, reason)
+        return Route("large", p.large_model, p.fast_model, p.large_timeout, reason)
+
+    def route(self, mode: str, prompt_tokens: int, edit: bool = False) -> Route:
+        if mode in self.policy.large_modes:
+            return self._route("large", "mode")
+        if edit:
+            return self._route("fast", "edit")
+        if prompt_tokens > self.policy.fast_max_prompt_tokens:
+            return self._route("large", "prompt_size")
+        return self._route("fast", "short_prompt")
+
+    def escalate(self, problem: str) -> Route:
+        return self._route("large", f"draft_{problem}")
+
+    def check_draft(self, mode: str, text: str, finish_reason: str = None, structured: bool = False):
+        """Return why a fast-tier draft is not good enough, or None if it is."""
+        if finish_reason == "length":
+            return "truncated"
+        if REFUSAL_RE.search(text[:300]):
+            return "refusal"
+        if count_tokens(text) < self.policy.min_answer_tokens.get(mode, 0):
+            return "too_short"
+        if structured:
+            # The schema check covers structure and the required phases.
+            try:
+                parse_plan(text)
+            except PlanError:
+                return "invalid_plan"
+            return None
+        if len(STRUCTURE_RE.findall(text)) < 3:
+            return "unstructured"
+        required = REQUIRED_RE.get(mode)
+        if required is not None and not required.search(text):
+            return "incomplete"
+        return None
+
+    @staticmethod
+    def cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        prompt_price, completion_price = PRICES.get(model, (0.0, 0.0))
+        return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
@@ -0,0 +1,194 @@
+import re
+import threading
+import zlib
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+FIELD_RE = re.compile(r"^\s*([A-Za-z][\w /()-]*):\s*(.*)$")
+STOP_WORDS = frozenset(
+    "a an and or the of to in on for with at by from is are am i my me some basic etc e g "
+    "any also very good want like".split()
+)
+# Fields that must match on their own, whatever the whole-profile score:
+# a plan for another role or degree is the wrong plan however alike the
+# rest of the profile is. Label -> the gate it belongs to.
+GATED_FIELDS = {"target roles": "role", "target role": "role", "education": "education"}
+
+
+def profile_fields(prompt: str):
+    # The form prompts are "Label: value" lines; returns (label, value) pairs.
+    return [(m.group(1).strip().lower(), m.group(2)) for m in map(FIELD_RE.match, prompt.splitlines()) if m]
+
+
+def profile_text(prompt: str) -> str:
+    # Only the field values tell two profiles apart, so everything else is dropped.
+    fields = profile_fields(prompt)
+    if not fields:
+        return prompt
+    return " ".join(value for _, value in fields)
+
+
+class HashingEmbedder:
+    # CPU-only hashed bag of words + character trigrams, L2-normalized.
+
+    def __init__(self, dim: int = 128):
+        self.dim = dim
+
+    def features(self, text: str):
+        words = [w for w in TOKEN_RE.findall(profile_text(text).lower()) if w not in STOP_WORDS]
+        feats = list(words)
+        for w in words:
+            padded = f"^{w}$"
+            feats.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return feats
+
+    def embed(self, text: str):
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feat in self.features(text):
+            h = zlib.crc32(feat.encode("utf-8"))
+            vec[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+
+def fold(vectors):
+    # Half-width copy (first half + second half of each vector): its dot
+    # products estimate the full ones at half the memory traffic.
+    half = vectors.shape[-1] // 2
+    return vectors[..., :half] + vectors[..., half: 2 * half]
+
+
+class VectorIndex:
+    """Fixed-capacity ring of unit vectors.
+
+    Small indexes are scanned exactly: one matrix-vector product. Past
+    exact_items, a lookup scans a folded half-width copy of the matrix
+    for the best `shortlist` candidates and scores only those exactly.
+    The scan is memory-bound, so this about halves lookup time; the
+    price is that a near-best match can occasionally win over the best.
+    """
+
+    def __init__(self, dim: int, max_items: int = 100_000, exact_items: int = 8192, shortlist: int = 1024):
+        self.dim = dim
+        self.max_items = max_items
+        self.exact_items = exact_items
+        self.shortlist = shortlist
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._folded = np.zeros((0, dim // 2), dtype=np.float32)
+        self._payloads = []
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self):
+        capacity = min(self.max_items, max(1024, 2 * len(self._vectors)))
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        folded = np.zeros((capacity, self.dim // 2), dtype=np.float32)
+        folded[: self._size] = self._folded[: self._size]
+        self._vectors, self._folded = vectors, folded
+
+    def add(self, vector, payload):
+        with self._lock:
+            if self._size < self.max_items and self._size == len(self._vectors):
+                self._grow()
+            slot = self._next
+            self._vectors[slot] = vector
+            self._folded[slot] = fold(self._vectors[slot])
+            if slot < len(self._payloads):
+                self._payloads[slot] = payload
+            else:
+                self._payloads.append(payload)
+            self._size = max(self._size, slot + 1)
+            self._next = (slot + 1) % self.max_items
+
+    def search(self, vector, k: int = 1, exact: bool = False):
+        with self._lock:
+            if not self._size:
+                return []
+            k = min(k, self._size)
+            if exact or self._size <= max(self.exact_items, self.shortlist):
+                rows = None
+                scores = self._vectors[: self._size] @ vector
+            else:
+                estimates = self._folded[: self._size] @ fold(vector)
+                rows = np.argpartition(-estimates, self.shortlist - 1)[: self.shortlist]
+                scores = self._vectors[rows] @ vector
+                k = min(k, len(rows))
+            if k == 1:
+                top = [int(np.argmax(scores))]
+            else:
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top])]
+            return [
+                (float(scores[i]), self._payloads[i if rows is None else int(rows[i])]) for i in top
+            ]
+
+
+class SemanticCache:
+    # Serves a stored answer when a new prompt is close enough to an old one.
+    # Each group (mode + model) has its own index so lookups never mix modes.
+    # A hit also needs the role and education to match on their own (at
+    # field_threshold), like PrecomputedStore's role check.
+
+    def __init__(self, threshold: float = 0.95, dim: int = 128, max_items: int = 100_000,
+                 field_threshold: float = 0.8):
+        self.threshold = threshold
+        self.field_threshold = field_threshold
+        self.max_items = max_items
+        self.embedder = HashingEmbedder(dim)
+        self.hits = 0
+        self.misses = 0
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def _index(self, group: str):
+        with self._lock:
+            if group not in self._indexes:
+                self._indexes[group] = VectorIndex(self.embedder.dim, self.max_items)
+            return self._indexes[group]
+
+    def gates(self, prompt: str):
+        # Gate -> embedding of that field's value; a field left empty is absent.
+        gates = {}
+        for label, value in profile_fields(prompt):
+            gate = GATED_FIELDS.get(label)
+            if gate is not None and value.strip():
+                gates[gate] = self.embedder.embed(value)
+        return gates
+
+    def same_gates(self, a, b) -> bool:
+        if a.keys() != b.keys():
+            return False
+        return all(float(a[gate] @ b[gate]) >= self.field_threshold for gate in a)
+
+    def lookup(self, prompt: str, group: str = "", near_threshold: float = None):
+        """Best (score, answer) at or above threshold, else None.
+
+        With near_threshold, a weaker match at or above it is returned too
+        (still counted as a miss); callers compare the score to threshold.
+        Matches whose role or education differs are skipped either way.
+        """
+        floor = self.threshold if near_threshold is None else min(near_threshold, self.threshold)
+        gates = self.gates(prompt)
+        for score, (answer, stored_gates) in self._index(group).search(self.embedder.embed(prompt), k=5):
+            if score < floor:
+                break
+            if self.same_gates(gates, stored_gates):
+                if score >= self.threshold:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                return score, answer
+        self.misses += 1
+        return None
+
+    def add(self, prompt: str, answer: str, group: str = ""):
+        self._index(group).add(self.embedder.embed(prompt), (answer, self.gates(prompt)))
+
+    def __len__(self):
+        return sum(len(index) for index in self._indexes.values())
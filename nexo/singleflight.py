@@ -0,0 +1,90 @@
+import threading
+
+
+class Flight:
+    # One in-flight generation. Chunks are kept so late joiners replay the
+    # text produced so far and then follow along live.
+
+    def __init__(self):
+        self._chunks = []
+        self._done = False
+        self._error = None
+        self._cond = threading.Condition()
+
+    def publish(self, chunk: str):
+        with self._cond:
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error: BaseException = None):
+        with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+
+    def __iter__(self):
+        i = 0
+        while True:
+            with self._cond:
+                while i >= len(self._chunks) and not self._done:
+                    self._cond.wait()
+                pending = self._chunks[i:]
+                done, error = self._done, self._error
+            yield from pending
+            i += len(pending)
+            if done and i >= len(self._chunks):
+                if error is not None:
+                    raise error
+                return
+
+    def result(self) -> str:
+        return "".join(self)
+
+
+class SingleFlight:
+    # Coalesces identical requests: the first caller for a key starts the
+    # producer on its own thread, later callers attach to the same Flight.
+    # The producer runs to completion even if every caller goes away, so a
+    # rerun never throws away tokens that are already being paid for.
+
+    def __init__(self):
+        self.started = 0
+        self.shared = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def flight(self, key: str, produce, on_complete=None) -> Flight:
+        with self._lock:
+            existing = self._flights.get(key)
+            if existing is not None:
+                self.shared += 1
+                return existing
+            flight = Flight()
+            self._flights[key] = flight
+            self.started += 1
+        threading.Thread(
+            target=self._run, args=(key, flight, produce, on_complete), daemon=True, name="nexo-flight"
+        ).start()
+        return flight
+
+    def _run(self, key, flight, produce, on_complete):
+        error = None
+        try:
+            parts = []
+            for chunk in produce():
+                parts.append(chunk)
+                flight.publish(chunk)
+            if on_complete is not None:
+                on_complete("".join(parts))
+        except Exception as exc:
+            error = exc
+        finally:
+            # Drop the key before waking waiters: by then on_complete has
+            # filled the caches, so a new caller either hits those or starts fresh.
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.finish(error)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
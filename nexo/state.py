@@ -0,0 +1,61 @@
+"""Where process-wide state lives: in this process, or shared by replicas.
+
+The response cache, the request/token rate limits and durable history
+go through a backend. LocalState keeps them in the process (SQLite for
+history), which is right for a single server. RedisState keeps them in
+Redis, so replicas behind a load balancer share one quota and each
+other's answers. Both offer the same three factories.
+"""
+import os
+from urllib.parse import urlparse
+
+from nexo.cache import RedisCacheStore, SQLiteCacheStore
+from nexo.engine import RedisTokenBucket, TokenBucket
+from nexo.history import HistoryStore, RedisHistoryStore
+
+
+class LocalState:
+    shared = False
+
+    def cache_store(self, ttl_seconds: float, sqlite_path: str = None):
+        return SQLiteCacheStore(sqlite_path) if sqlite_path else None
+
+    def token_bucket(self, name: str, rate_per_minute: float):
+        return TokenBucket(rate_per_minute)
+
+    def history_store(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return HistoryStore(path)
+
+
+class RedisState:
+    shared = True
+
+    def __init__(self, client, prefix: str = "nexo:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "nexo:"):
+        # redis-py is only needed when a shared backend is configured.
+        import redis
+
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def cache_store(self, ttl_seconds: float, sqlite_path: str = None):
+        return RedisCacheStore(self.client, ttl_seconds, self.prefix)
+
+    def token_bucket(self, name: str, rate_per_minute: float):
+        return RedisTokenBucket(self.client, f"{self.prefix}bucket:{name}", rate_per_minute)
+
+    def history_store(self, path: str = None):
+        return RedisHistoryStore(self.client, self.prefix)
+
+
+def make_state(url: str = "", prefix: str = "nexo:"):
+    """Backend for a STATE_BACKEND_URL: empty for LocalState, redis:// (or rediss://, unix://) for RedisState."""
+    if not url:
+        return LocalState()
+    if urlparse(url).scheme in ("redis", "rediss", "unix"):
+        return RedisState.from_url(url, prefix)
+    raise ValueError(f"unsupported state backend: {url}")
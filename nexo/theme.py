@@ -0,0 +1,49 @@
+# Theme palettes. The stylesheet (static/nexo.css) reads these through CSS
+# variables, so switching theme only swaps this small block.
+THEMES = {
+    "dark": {
+        "bg": "radial-gradient(circle at top left, #020617 0, #020617 40%, #000000 100%)",
+        "text": "#e5e7eb",
+        "muted": "#9ca3af",
+        "card-bg": "rgba(15,23,42,0.95)",
+        "card-border": "rgba(31,41,55,0.9)",
+        "response-bg": "rgba(15,23,42,0.95)",
+        "response-border": "rgba(148,163,184,0.7)",
+        "tab-indicator": "#f97316",
+    },
+    "light": {
+        "bg": "#f8fafc",
+        "text": "#0f172a",
+        "muted": "#4b5563",
+        "card-bg": "#ffffff",
+        "card-border": "rgba(148,163,184,0.6)",
+        "response-bg": "#ffffff",
+        "response-border": "rgba(148,163,184,0.9)",
+        "tab-indicator": "#ef4444",
+    },
+}
+
+# Topic priority chips in structured plans. Inlined into the rendered HTML,
+# which is why plan HTML is cached per theme.
+PRIORITY_COLORS = {
+    "dark": {"high": "#f87171", "medium": "#fbbf24", "low": "#34d399"},
+    "light": {"high": "#b91c1c", "medium": "#b45309", "low": "#047857"},
+}
+
+# Bump when static/nexo.css changes so browsers drop their cached copy.
+STYLESHEET_VERSION = 2
+STYLESHEET_URL = f"app/static/nexo.css?v={STYLESHEET_VERSION}"
+
+# Built once per process.
+THEME_MARKUP = {
+    name: (
+        "<style>:root{"
+        + "".join(f"--nexo-{key}:{value};" for key, value in palette.items())
+        + f'}}</style><link rel="stylesheet" href="{STYLESHEET_URL}">'
+    )
+    for name, palette in THEMES.items()
+}
+
+
+def theme_markup(theme: str) -> str:
+    return THEME_MARKUP.get(theme, THEME_MARKUP["dark"])
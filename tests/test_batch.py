@@ -0,0 +1,92 @@
+"""Cohort batch parsing and background runs."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from nexo.batch import BatchRun, BatchRuns, parse_rows
+
+
+class StubEngine:
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+
+    def complete(self, messages, **kwargs):
+        if any(text in messages[1]["content"] for text in self.fail_on):
+            raise RuntimeError("model down")
+        message = SimpleNamespace(content="## Plan")
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=message)])
+
+
+def test_parse_rows_reads_csv_and_jsonl():
+    csv_rows = parse_rows("Name,Education,Target_Roles\nAisha,BCA,SDE-1\n", "cohort.csv")
+    jsonl_rows = parse_rows('{"name": "Aisha", "education": "BCA", "target_roles": "SDE-1"}\n\n', "cohort.jsonl")
+    assert csv_rows == jsonl_rows
+    assert csv_rows[0]["skills"] == ""
+
+
+def test_parse_rows_names_the_bad_jsonl_line():
+    with pytest.raises(ValueError, match="line 2 is not valid JSON"):
+        parse_rows('{"name": "a"}\n{"name": \n', "cohort.jsonl")
+    with pytest.raises(ValueError, match="line 1 is not a JSON object"):
+        parse_rows('["a"]\n', "cohort.jsonl")
+
+
+def wait_for(run):
+    deadline = time.monotonic() + 5
+    while not run.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert run.finished
+
+
+def test_batch_run_counts_progress_and_resumes(tmp_path):
+    rows = parse_rows("name,education\nAisha,BCA\nRahul,MCA\nMeera,B.Sc\n", "cohort.csv")
+    output = str(tmp_path / "plans.jsonl")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        run = BatchRun(rows, output, StubEngine(fail_on={"MCA"}), concurrency=2).start(pool)
+        wait_for(run)
+        assert (run.total, run.done, run.failed, run.error) == (3, 2, 1, None)
+
+        rerun = BatchRun(rows, output, StubEngine(), concurrency=2)
+        assert rerun.done == 2
+        wait_for(rerun.start(pool))
+        assert (rerun.done, rerun.failed) == (3, 0)
+
+
+def test_batch_run_records_a_stopped_run(tmp_path):
+    rows = parse_rows("name\nAisha\n", "cohort.csv")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        run = BatchRun(rows, str(tmp_path / "missing" / "plans.jsonl"), StubEngine()).start(pool)
+        wait_for(run)
+    assert isinstance(run.error, OSError)
+
+
+def test_batch_runs_share_a_running_file(tmp_path):
+    rows = parse_rows("name,education\nAisha,BCA\n", "cohort.csv")
+    output = str(tmp_path / "plans.jsonl")
+    gate = threading.Event()
+
+    class SlowEngine(StubEngine):
+        def complete(self, messages, **kwargs):
+            gate.wait(5)
+            return super().complete(messages, **kwargs)
+
+    made = []
+
+    def make_run():
+        made.append(BatchRun(rows, output, SlowEngine()))
+        return made[-1]
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        runs = BatchRuns(pool)
+        first = runs.start(output, make_run)
+        assert runs.start(output, make_run) is first
+        gate.set()
+        wait_for(first)
+        # A finished run is not reused: uploading again resumes in a new one.
+        assert runs.start(output, make_run) is not first
+    assert len(made) == 2
+    with open(output, encoding="utf-8") as f:
+        assert len(f.readlines()) == 1
@@ -0,0 +1,66 @@
+"""CircuitBreaker transitions and which errors count against the model."""
+import time
+
+import groq
+import httpx
+
+from nexo.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, is_model_failure
+
+REQUEST = httpx.Request("POST", "http://groq.test/chat")
+
+
+def status_error(cls, status: int):
+    return cls(f"status {status}", response=httpx.Response(status, request=REQUEST), body=None)
+
+
+def test_opens_on_error_rate():
+    breaker = CircuitBreaker(min_calls=4, error_rate=0.5, open_seconds=60)
+    for ok in (True, False, True):
+        breaker.record(ok, 0.1)
+    assert breaker.state == CLOSED
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() > 59
+
+
+def test_opens_on_slow_calls():
+    breaker = CircuitBreaker(min_calls=2, slow_seconds=1.0, slow_rate=0.5)
+    breaker.record(True, 0.1)
+    breaker.record(True, 2.0)
+    assert breaker.state == OPEN
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker(min_calls=1, open_seconds=0.05)
+    breaker.record(False, 0.1)
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # one probe at a time
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+
+
+def test_released_probe_lets_the_next_call_probe():
+    breaker = CircuitBreaker(min_calls=1, open_seconds=60)
+    breaker.record(False, 0.1)
+    breaker._changed -= 60
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+
+def test_only_transient_errors_count_as_failures():
+    assert is_model_failure(groq.APITimeoutError(request=REQUEST))
+    assert is_model_failure(groq.APIConnectionError(request=REQUEST))
+    assert is_model_failure(status_error(groq.RateLimitError, 429))
+    assert is_model_failure(status_error(groq.InternalServerError, 503))
+    assert not is_model_failure(status_error(groq.BadRequestError, 400))
+    assert not is_model_failure(status_error(groq.APIStatusError, 413))
+    assert not is_model_failure(ValueError("bad plan"))
@@ -0,0 +1,195 @@
+"""RequestEngine against a stub Groq client: retries, streaming, rate limits, fallback, concurrency."""
+import threading
+import time
+from types import SimpleNamespace
+
+import groq
+import httpx
+import pytest
+
+from nexo.engine import RequestEngine, TokenBucket
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def api_error(status: int, retry_after: str = None):
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    response = httpx.Response(status, headers=headers, request=httpx.Request("POST", "http://groq.test/chat"))
+    cls = groq.RateLimitError if status == 429 else groq.InternalServerError
+    return cls(f"status {status}", response=response, body=None)
+
+
+def connection_error():
+    return groq.APIConnectionError(request=httpx.Request("POST", "http://groq.test/chat"))
+
+
+class FakeStream:
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.closed = False
+
+    def __iter__(self):
+        yield from self.chunks
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        self.closed = True
+
+
+class StubClient:
+    # Plays back `script` one call at a time: an exception is raised, anything
+    # else is returned. Records the kwargs of every call.
+
+    def __init__(self, *script, delay: float = 0.0):
+        self.script = list(script)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            result = self.script.pop(0) if self.script else completion()
+        try:
+            time.sleep(self.delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+def completion(model: str = "m"):
+    return SimpleNamespace(model=model, usage=None, choices=[])
+
+
+def chunk(text: str):
+    return SimpleNamespace(text=text)
+
+
+@pytest.fixture
+def make_engine():
+    engines = []
+
+    def make(client, **kwargs):
+        kwargs = {"requests_per_minute": 6000, "tokens_per_minute": 600_000, "backoff_base": 0.01, **kwargs}
+        engine = RequestEngine(client, **kwargs)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.shutdown()
+
+
+def test_429_is_retried_after_retry_after(make_engine):
+    client = StubClient(api_error(429, retry_after="0.3"), completion())
+    engine = make_engine(client)
+    started = time.monotonic()
+    engine.complete(model="m", messages=MESSAGES)
+    assert time.monotonic() - started >= 0.3
+    assert len(client.calls) == 2
+    assert engine.retries == 1
+
+
+def test_retries_give_up_after_max_retries(make_engine):
+    client = StubClient(*[api_error(500)] * 5)
+    engine = make_engine(client, max_retries=2)
+    with pytest.raises(groq.InternalServerError):
+        engine.complete(model="m", messages=MESSAGES)
+    assert len(client.calls) == 3
+
+
+def test_client_errors_are_not_retried(make_engine):
+    client = StubClient(groq.BadRequestError(
+        "bad", response=httpx.Response(400, request=httpx.Request("POST", "http://groq.test/chat")), body=None,
+    ))
+    engine = make_engine(client)
+    with pytest.raises(groq.BadRequestError):
+        engine.complete(model="m", messages=MESSAGES)
+    assert len(client.calls) == 1
+
+
+def test_stream_failing_before_first_chunk_is_retried(make_engine):
+    client = StubClient(FakeStream([], error=connection_error()), FakeStream([chunk("a"), chunk("b")]))
+    engine = make_engine(client)
+    assert [c.text for c in engine.stream(model="m", messages=MESSAGES)] == ["a", "b"]
+    assert len(client.calls) == 2
+
+
+def test_stream_is_not_retried_after_first_chunk(make_engine):
+    stream = FakeStream([chunk("a")], error=connection_error())
+    client = StubClient(stream, FakeStream([chunk("a"), chunk("b")]))
+    engine = make_engine(client)
+    received = []
+    with pytest.raises(groq.APIConnectionError):
+        for c in engine.stream(model="m", messages=MESSAGES):
+            received.append(c.text)
+    assert received == ["a"]
+    assert len(client.calls) == 1
+    assert engine.retries == 0
+    assert stream.closed
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10 per second
+    bucket.acquire()
+    started = time.monotonic()
+    bucket.acquire()
+    assert 0.07 <= time.monotonic() - started < 0.5
+
+
+def test_token_bucket_debt_delays_next_acquire():
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)
+    bucket.consume(2)  # usage reported after the call: level is now -1
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.17
+
+
+def test_engine_waits_on_request_bucket(make_engine):
+    engine = make_engine(StubClient(), requests_per_minute=600)
+    engine.request_bucket.consume(engine.request_bucket.available())
+    started = time.monotonic()
+    for _ in range(3):
+        engine.complete(model="m", messages=MESSAGES)
+    assert time.monotonic() - started >= 0.25
+
+
+def test_429_switches_to_fallback_model_without_backoff(make_engine):
+    client = StubClient(api_error(429, retry_after="5"), completion("fast"))
+    engine = make_engine(client)
+    started = time.monotonic()
+    result = engine.complete(model="large", fallback_model="fast", messages=MESSAGES)
+    assert time.monotonic() - started < 1
+    assert [call["model"] for call in client.calls] == ["large", "fast"]
+    assert result.model == "fast"
+    assert engine.fallbacks == 1
+    assert engine.retries == 0
+
+
+def test_fallback_model_errors_back_off_normally(make_engine):
+    client = StubClient(api_error(429), api_error(429), completion("fast"))
+    engine = make_engine(client)
+    engine.complete(model="large", fallback_model="fast", messages=MESSAGES)
+    assert [call["model"] for call in client.calls] == ["large", "fast", "fast"]
+    assert engine.fallbacks == 1
+    assert engine.retries == 1
+
+
+def test_max_in_flight_bounds_concurrent_calls(make_engine):
+    client = StubClient(delay=0.05)
+    engine = make_engine(client, max_in_flight=2)
+    futures = [engine.submit(model="m", messages=MESSAGES) for _ in range(6)]
+    for future in futures:
+        future.result(timeout=5)
+    assert len(client.calls) == 6
+    assert client.peak == 2
@@ -0,0 +1,64 @@
+"""HistoryStore's background writer under SQLite errors."""
+import sqlite3
+import threading
+
+from nexo.history import HistoryEntry, HistoryStore
+
+
+def entry(seq: int, text: str = "plan"):
+    return HistoryEntry.create(seq, "Career Direction", "2026-01-01 10:00", "BCA | SDE-1", "profile", text)
+
+
+def flush_returns(store, timeout: float = 5.0) -> bool:
+    thread = threading.Thread(target=store.flush, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+
+def test_seq_clash_keeps_the_rest_of_the_batch(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"), flush_interval=0.2)
+    store.write("a", entry(1))
+    assert flush_returns(store)
+    # One batch: another user's entry, a clash on ("a", 1), and a third user's.
+    store.write("b", entry(1))
+    store.write("a", entry(1, "second plan"))
+    store.write("c", entry(1))
+    assert flush_returns(store)
+    assert [e.seq for e in store.read("b", 10**9, 10)] == [1]
+    assert [e.seq for e in store.read("c", 10**9, 10)] == [1]
+    assert [(e.seq, e.output) for e in store.read("a", 10**9, 10)] == [(2, "second plan"), (1, "plan")]
+
+
+def test_locked_database_is_retried_and_writer_survives(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path / "history.db"), retry_delay=0.01)
+    insert = store._insert
+    failures = iter([True, True])
+
+    def flaky_insert(user_token, e):
+        if next(failures, False):
+            raise sqlite3.OperationalError("database is locked")
+        insert(user_token, e)
+
+    monkeypatch.setattr(store, "_insert", flaky_insert)
+    store.write("a", entry(1))
+    assert flush_returns(store)
+    assert store.stats("a") == (1, 1)
+
+
+def test_writer_keeps_running_after_dropping_an_entry(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path / "history.db"), write_attempts=2, retry_delay=0.01)
+    insert = store._insert
+
+    def failing_insert(user_token, e):
+        if user_token == "bad":
+            raise sqlite3.OperationalError("database or disk is full")
+        insert(user_token, e)
+
+    monkeypatch.setattr(store, "_insert", failing_insert)
+    store.write("bad", entry(1))
+    assert flush_returns(store)
+    store.write("good", entry(1))
+    assert flush_returns(store)
+    assert store.stats("bad") == (0, -1)
+    assert store.stats("good") == (1, 1)
@@ -0,0 +1,41 @@
+"""JobQueue: ids known before a job runs, results and a full queue."""
+import threading
+import time
+
+import pytest
+
+from nexo.jobs import JobQueue, JobQueueFull, new_job_id
+
+
+def test_on_done_sees_the_id_given_to_submit():
+    # The session records the id before submitting, so a job that finishes
+    # at once still finds itself there.
+    owner = {}
+    seen = []
+    queue = JobQueue(workers=1)
+    job_id = new_job_id()
+    owner["career"] = job_id
+    job = queue.submit(lambda: iter(["a", "b"]), on_done=lambda j: seen.append(owner["career"] == j.id),
+                       job_id=job_id)
+    assert job.id == job_id
+    assert "".join(job.progress) == "ab"
+    assert seen == [True]
+    assert queue.get(job_id).result == "ab"
+
+
+def test_submit_raises_when_the_queue_is_full():
+    release = threading.Event()
+    queue = JobQueue(workers=1, max_queued=1)
+
+    def slow():
+        release.wait(5)
+        yield "done"
+
+    running = queue.submit(slow)
+    while running.status == "queued":
+        time.sleep(0.01)
+    queue.submit(slow)
+    with pytest.raises(JobQueueFull):
+        queue.submit(slow, job_id="rejected")
+    assert queue.get("rejected") is None
+    release.set()
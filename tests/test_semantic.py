@@ -0,0 +1,45 @@
+"""SemanticCache must not serve a plan across names, roles or degrees."""
+from nexo.prompts import build_career_prompt, build_messages
+from nexo.semantic import SemanticCache
+
+PROFILE = dict(
+    name="Aisha Khan", education="B.Tech CSE, final year", skills="Python, DSA, SQL, basic ML",
+    interests="backend, data", target_roles="SDE-1", notes="Tier-3 college, no internship yet",
+)
+
+
+def cache_with_profile():
+    cache = SemanticCache()
+    cache.add(build_career_prompt(**PROFILE), "SDE-1 plan")
+    return cache
+
+
+def lookup(cache, near_threshold=None, **changes):
+    return cache.lookup(build_career_prompt(**{**PROFILE, **changes}), near_threshold=near_threshold)
+
+
+def test_rewording_is_a_hit():
+    cache = cache_with_profile()
+    assert lookup(cache, skills="python, dsa, sql, ML basics")[1] == "SDE-1 plan"
+
+
+def test_a_name_never_reaches_another_student():
+    # The model never sees the name, so a plan served to a student with the
+    # same profile can't be addressed to whoever asked first.
+    aisha = build_career_prompt(**PROFILE)
+    rahul = build_career_prompt(**{**PROFILE, "name": "Rahul Verma"})
+    assert "Aisha" not in aisha
+    assert "Aisha" not in " ".join(m["content"] for m in build_messages(aisha, "career_direction"))
+    cache = SemanticCache()
+    cache.add(aisha, "plan written from Aisha's prompt")
+    assert lookup(cache, name="Rahul Verma")[1] == "plan written from Aisha's prompt"
+    assert rahul == aisha
+
+
+def test_other_role_or_education_is_never_served():
+    cache = cache_with_profile()
+    for changes in (dict(target_roles="Data Scientist"), dict(target_roles="DevOps Engineer"),
+                    dict(education="BCA, final year"), dict(education="B.Tech IT, 3rd year")):
+        assert lookup(cache, **changes) is None, changes
+        # Not as a base to adapt either.
+        assert lookup(cache, near_threshold=0.5, **changes) is None, changes
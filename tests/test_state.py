@@ -0,0 +1,134 @@
+"""Redis-backed shared state (cache store, token bucket, history) on fakeredis."""
+from types import SimpleNamespace
+
+import pytest
+
+from nexo.cache import RedisCacheStore, ResponseCache
+from nexo.engine import RedisTokenBucket
+from nexo.history import HistoryEntry, RedisHistoryStore
+from nexo.state import LocalState, RedisState, make_state
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer())
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Wall clock for the bucket script and history prune, moved by hand.
+    now = [1_000_000.0]
+    fake = SimpleNamespace(time=lambda: now[0], sleep=lambda seconds: now.__setitem__(0, now[0] + seconds))
+    monkeypatch.setattr("nexo.engine.time", fake)
+    monkeypatch.setattr("nexo.history.time", fake)
+    return now
+
+
+def entry(seq: int, output: str = "plan", summary: str = "BCA | SDE-1"):
+    return HistoryEntry.create(seq, "Career Direction", "2026-01-01 10:00", summary, "profile", output)
+
+
+def test_cache_store_sets_a_ttl_and_ignores_stale_entries(client):
+    store = RedisCacheStore(client, ttl_seconds=3600)
+    store.set("k", "answer", created=1_000.0)
+    assert 3590 <= client.ttl("nexo:cache:k") <= 3600
+    assert store.get("k", ttl_seconds=10**12) == ("answer", 1_000.0)
+    # Older than the cache's own TTL: a miss even though Redis still has it.
+    assert store.get("k", ttl_seconds=60) is None
+    assert store.get("missing", ttl_seconds=60) is None
+    store.clear()
+    assert client.exists("nexo:cache:k") == 0
+
+
+def test_response_caches_share_the_redis_store(client):
+    first = ResponseCache(store=RedisCacheStore(client, 3600))
+    second = ResponseCache(store=RedisCacheStore(client, 3600))
+    first.set("k", "answer")
+    assert second.get("k") == "answer"
+    assert second.hits == 1
+
+
+def test_bucket_take_waits_once_empty(client, clock):
+    pytest.importorskip("lupa")
+    bucket = RedisTokenBucket(client, "nexo:bucket:requests", rate_per_minute=60, capacity=2)
+    assert bucket._run("take", 1) == (0.0, 1.0)
+    assert bucket._run("take", 1) == (0.0, 0.0)
+    # Empty: nothing is taken, and the wait is the time to refill one token.
+    assert bucket._run("take", 1) == (1.0, 0.0)
+    assert client.ttl("nexo:bucket:requests") == int(2 / 1.0) + 60
+    clock[0] += 0.5
+    assert bucket.available() == 0.5
+
+
+def test_bucket_consume_goes_into_debt_and_peek_refills(client, clock):
+    pytest.importorskip("lupa")
+    bucket = RedisTokenBucket(client, "nexo:bucket:tokens", rate_per_minute=600, capacity=100)
+    bucket.consume(130)
+    assert bucket.available() == -30
+    # Repaying the debt and taking 10 more needs 40 tokens at 10 a second.
+    assert bucket._run("take", 10) == (4.0, -30.0)
+    clock[0] += 100
+    assert bucket.available() == 100
+
+
+def test_bucket_is_shared_and_acquire_sleeps_until_refilled(client, clock):
+    pytest.importorskip("lupa")
+    replica_a = RedisTokenBucket(client, "nexo:bucket:requests", rate_per_minute=60, capacity=1)
+    replica_b = RedisTokenBucket(client, "nexo:bucket:requests", rate_per_minute=60, capacity=1)
+    started = clock[0]
+    replica_a.acquire()
+    replica_b.acquire()
+    assert clock[0] - started == pytest.approx(1.0)
+    assert replica_a.available() == 0
+
+
+def test_history_round_trip(client):
+    store = RedisHistoryStore(client)
+    assert store.stats("a") == (0, -1)
+    for seq in (1, 2, 3):
+        store.write("a", entry(seq, f"plan {seq}"))
+    store.write("b", entry(7, "other user's plan"))
+    store.flush()
+    assert store.stats("a") == (3, 3)
+    newest = store.read("a", 10**9, 2)
+    assert [(e.seq, e.output, e.input) for e in newest] == [(3, "plan 3", "profile"), (2, "plan 2", "profile")]
+    assert [e.seq for e in store.read("a", 3, 10)] == [2, 1]
+    assert [e.seq for e in store.read("a", 10**9, 10, offset=2)] == [1]
+    assert newest[0].summary == "BCA | SDE-1" and newest[0].mode == "Career Direction"
+
+
+def test_history_search_matches_every_word_newest_first(client):
+    store = RedisHistoryStore(client)
+    store.write("a", entry(1, "Learn DSA and build projects"))
+    store.write("a", entry(2, "Learn cloud basics"))
+    store.write("a", entry(3, "Build projects with DSA"))
+    assert [e.seq for e in store.search("a", "dsa projects")] == [3, 1]
+    assert [e.seq for e in store.search("a", "learn", limit=1)] == [2]
+    assert store.search("a", "  ") == []
+    assert store.search("b", "dsa") == []
+
+
+def test_history_delete_and_prune(client, clock):
+    store = RedisHistoryStore(client)
+    store.write("a", entry(1))
+    store.write("b", entry(1))
+    clock[0] += 3600
+    store.write("a", entry(2))
+    store.prune(max_age_seconds=60)
+    assert [e.seq for e in store.read("a", 10**9, 10)] == [2]
+    assert store.stats("b") == (0, -1)
+    store.delete("a")
+    assert store.stats("a") == (0, -1)
+    assert client.keys("nexo:history:*") == []
+
+
+def test_make_state_picks_the_backend(client):
+    assert isinstance(make_state(""), LocalState)
+    assert isinstance(make_state("redis://localhost:6379/0"), RedisState)
+    with pytest.raises(ValueError):
+        make_state("memcached://localhost")
+    state = RedisState(client, prefix="test:")
+    state.cache_store(60).set("k", "v", created=0)
+    assert client.exists("test:cache:k") == 1
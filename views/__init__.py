@@ -0,0 +1,14 @@
+"""Pages of the Streamlit app, imported on first visit by streamlit_app.py."""
+import importlib
+
+PAGE_MODULES = {
+    "Home": "views.home",
+    "About": "views.about",
+    "Contact": "views.contact",
+    "Settings": "views.settings",
+    "Admin": "views.admin",
+}
+
+
+def render_page(name: str):
+    importlib.import_module(PAGE_MODULES[name]).render()
@@ -0,0 +1,31 @@
+"""About page."""
+import streamlit as st
+
+
+def render():
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">About Nexo AI</div>', unsafe_allow_html=True)
+    st.markdown(
+        """
+**Nexo AI** is a personal AI career assistant built by **Niyaz Khan**.
+
+It helps students and freshers:
+
+- Understand possible **career paths** in tech  
+- Plan **short-term, mid-term and long-term** actions  
+- Prepare for **interviews** in a structured way  
+- Explore high-quality **learning resources** without confusion  
+        """
+    )
+    st.markdown("---")
+    st.markdown("#### About Niyaz")
+    st.markdown(
+        """
+- **Name:** Niyaz Khan  
+- **Degree:** B.Tech in Computer Science Engineering  
+- **Interests:** AI, careers, web apps, and building real products.  
+
+> Nexo AI is one of his projects to help students like him get clear guidance.
+        """
+    )
+    st.markdown("</div>", unsafe_allow_html=True)
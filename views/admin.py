@@ -0,0 +1,54 @@
+"""Admin page: in-process metrics, listed only with ?admin=<ADMIN_TOKEN>."""
+import streamlit as st
+
+from nexo.prompts import template_report
+from views.services import get_circuit_breaker, get_metrics
+
+
+def render():
+    metrics = get_metrics()
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">Admin · Metrics</div>', unsafe_allow_html=True)
+    st.caption("Percentiles over the most recent samples of each series in this process.")
+    breaker = get_circuit_breaker()
+    retry_in = breaker.retry_in()
+    st.caption(
+        f"Model circuit breaker: **{breaker.state.replace('_', '-')}**"
+        + (f", next probe in {retry_in:.0f} s" if retry_in else "")
+    )
+
+    st.markdown("##### Latency & size")
+    st.dataframe(
+        [
+            {
+                "metric": name,
+                "labels": ", ".join(f"{k}={v}" for k, v in labels.items()),
+                "count": count,
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+            }
+            for name, labels, count, (p50, p95, p99) in metrics.percentiles()
+        ],
+        hide_index=True,
+    )
+
+    st.markdown("##### Counters")
+    st.dataframe(
+        [
+            {"metric": name, "labels": ", ".join(f"{k}={v}" for k, v in labels.items()), "value": value}
+            for name, labels, value in metrics.counters()
+        ],
+        hide_index=True,
+    )
+
+    st.markdown("##### Prompt templates")
+    st.caption(
+        "Fixed system-prompt tokens per template version. Token, TTFT and latency series above "
+        "carry a template label, so versions can be compared on cost and speed."
+    )
+    st.dataframe(template_report(), hide_index=True)
+
+    with st.expander("Prometheus text"):
+        st.code(metrics.render_prometheus(), language="text")
+    st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,177 @@
+"""Career Direction tab: profile form, plan, follow-ups and cohort batches."""
+import hashlib
+import os
+import tempfile
+
+import streamlit as st
+
+from nexo.batch import BatchRun, parse_rows
+from nexo.prompts import build_career_prompt
+from views.guidance import (
+    MODEL_NAME,
+    fit_to_budget,
+    render_followups,
+    render_guidance,
+    render_job,
+    submit_guidance,
+)
+from views.services import get_batch_engine, get_batch_runs, get_prompt_budget
+
+
+def start_batch(batch_file):
+    data = batch_file.getvalue()
+    try:
+        rows = parse_rows(data.decode("utf-8-sig"), batch_file.name)
+    except UnicodeDecodeError:
+        st.error("The cohort file isn't UTF-8 text. Save it as UTF-8 CSV or JSONL and upload it again.")
+        return
+    except ValueError as e:
+        st.error(f"The cohort file couldn't be read: {e}.")
+        return
+    if not rows:
+        st.error("The cohort file has no rows.")
+        return
+    stem = os.path.join(tempfile.gettempdir(), f"nexo_batch_{hashlib.sha1(data).hexdigest()[:12]}")
+    # Runs on its own pool and engine; the session keeps a handle to poll.
+    # Another session already running this file is joined, not repeated.
+    temperature = st.session_state.response_temperature
+    st.session_state.batch_run = get_batch_runs().start(f"{stem}.jsonl", lambda: BatchRun(
+        rows,
+        f"{stem}.jsonl",
+        get_batch_engine(),
+        model=MODEL_NAME,
+        temperature=temperature,
+        concurrency=int(st.secrets.get("BATCH_CONCURRENCY", 4)),
+        markdown_path=f"{stem}.md",
+        budget=get_prompt_budget(),
+    ))
+    st.session_state.batch_output = stem
+
+
+@st.fragment(run_every=1)
+def watch_batch():
+    # Polls only while the run is going; a full rerun then shows the downloads.
+    run = st.session_state.batch_run
+    if run.finished:
+        st.rerun()
+    text = f"{run.done}/{run.total} plans"
+    if run.failed:
+        text += f" · {run.failed} failed"
+    st.progress(run.done / max(1, run.total), text=text)
+
+
+def render():
+    left, right = st.columns([0.63, 0.37])
+
+    with left:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown('<div class="section-title">Career Direction</div>', unsafe_allow_html=True)
+        st.caption("Describe your current situation so Nexo AI can suggest a path.")
+
+        # Only the open tab is rendered, so submitted values are kept for the
+        # session instead of resetting whenever the user switches tabs.
+        with st.form("career_form"):
+            education = st.text_input(
+                "Education",
+                placeholder="B.Tech CSE, Final year",
+                key="career_education",
+                persist_state="session",
+            )
+            skills = st.text_area(
+                "What skills / technologies do you know?",
+                placeholder="e.g. Python, DSA, HTML/CSS, JS, basic ML…",
+                height=90,
+                key="career_skills",
+                persist_state="session",
+            )
+            interests = st.text_area(
+                "What are you most interested in?",
+                placeholder="e.g. web dev, data science, ML, cloud, startups…",
+                height=80,
+                key="career_interests",
+                persist_state="session",
+            )
+            target_roles = st.text_input(
+                "Target role(s)",
+                placeholder="e.g. SDE-1, Data Scientist, ML Engineer…",
+                key="career_target_roles",
+                persist_state="session",
+            )
+            notes = st.text_area(
+                "Other information (optional)",
+                placeholder="Internships, projects, constraints, dream companies etc.",
+                height=90,
+                key="career_notes",
+                persist_state="session",
+            )
+
+            submit_career = st.form_submit_button("Generate Career Plan 🚀")
+
+        personalise = st.session_state.pop("personalise_career_direction", None)
+        fresh = False
+        if submit_career:
+            fields, budget = fit_to_budget(
+                "career_direction", education=education, skills=skills,
+                interests=interests, target_roles=target_roles, notes=notes,
+            )
+            if budget.trimmed:
+                st.caption(f"Long input was shortened to fit: {', '.join(budget.trimmed)}.")
+            fresh = render_guidance(
+                "career_direction",
+                "Career Direction",
+                build_career_prompt(**fields),
+                spinner_text="Nexo AI is analysing your profile...",
+                max_tokens=budget.max_tokens,
+                summary=f"{education} | {target_roles}",
+                profile=(education, target_roles, ""),
+            )
+        elif personalise is not None:
+            fresh = submit_guidance("career_direction", "Career Direction", **personalise)
+        # Streams a running job, including one started before a rerun or tab switch.
+        fresh = render_job("career_direction") or fresh
+        render_followups("career_direction", "Career Direction", fresh=fresh)
+
+        with st.expander("Batch: plans for a whole cohort"):
+            st.caption(
+                "Upload a CSV or JSONL with columns name, education, skills, interests, "
+                "target_roles, notes. Re-uploading the same file resumes where it stopped."
+            )
+            batch_file = st.file_uploader("Cohort file", type=["csv", "jsonl"], key="batch_file")
+            run = st.session_state.get("batch_run")
+            if batch_file is not None and st.button(
+                "Generate cohort plans", disabled=run is not None and not run.finished
+            ):
+                start_batch(batch_file)
+                run = st.session_state.get("batch_run")
+            # Read after any start above: a queued run has no output files yet.
+            running = run is not None and not run.finished
+            if running:
+                watch_batch()
+            elif run is not None:
+                if run.error is not None:
+                    st.error(f"The batch stopped: {run.error}")
+                elif run.failed:
+                    st.warning(f"{run.failed} rows failed; run again to retry just those.")
+
+            stem = st.session_state.get("batch_output")
+            if stem and not running and os.path.exists(f"{stem}.jsonl") and os.path.exists(f"{stem}.md"):
+                col_jsonl, col_md = st.columns(2)
+                with open(f"{stem}.jsonl", "rb") as f:
+                    col_jsonl.download_button("Download JSONL", f.read(), file_name="cohort_plans.jsonl")
+                with open(f"{stem}.md", "rb") as f:
+                    col_md.download_button("Download Markdown", f.read(), file_name="cohort_plans.md")
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with right:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown('<div class="section-title">Quick tips</div>', unsafe_allow_html=True)
+        st.markdown(
+            """
+- Be honest about your **current level**.  
+- Mention **2–3 roles** you are curious about.  
+- Tell Nexo AI your **time availability** (e.g. 2 hrs/day).  
+- Add your **favourite companies** or type (startup, MNC, remote).
+            """
+        )
+        st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,17 @@
+"""Contact page."""
+import streamlit as st
+
+
+def render():
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">Contact</div>', unsafe_allow_html=True)
+    st.markdown("You can reach out to Niyaz for feedback or collaboration:")
+    st.markdown(
+        """
+- 📧 Email: **[niyaz.kofficials@gmail.com](mailto:niyaz.kofficials@gmail.com)**  
+- 💼 LinkedIn: **[linkedin.com/in/iamnk7](https://linkedin.com/in/iamnk7)**  
+- 💻 GitHub: **[github.com/Iamnk07](https://github.com/Iamnk07)**  
+- 📱 Phone / WhatsApp: **+91 7751931035**
+        """
+    )
+    st.markdown("</div>", unsafe_allow_html=True)
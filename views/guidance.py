@@ -0,0 +1,530 @@
+"""Guidance generation shared by the Career Direction and Interview Prep tabs."""
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from nexo.breaker import CircuitOpen, is_model_failure
+from nexo.cache import make_cache_key
+from nexo.engine import estimate_tokens
+from nexo.followup import Conversation
+from nexo.jobs import JobQueueFull, new_job_id
+from nexo.metrics import TOKEN_BUCKETS
+from nexo.plans import PlanError, as_markdown, is_plan, parse_plan
+from nexo.prompts import FOLLOWUP_KEY, TEMPLATES, build_edit_messages, build_messages
+from nexo.router import REDRAFT, final_answer
+from views.services import (
+    get_circuit_breaker,
+    get_job_queue,
+    get_metrics,
+    get_model_router,
+    get_plan_renderer,
+    get_precomputed_store,
+    get_prompt_budget,
+    get_request_engine,
+    get_resource_library,
+    get_response_cache,
+    get_semantic_cache,
+    get_single_flight,
+)
+
+metrics = get_metrics()
+response_cache = get_response_cache()
+inflight = get_single_flight()
+prompt_budget = get_prompt_budget()
+router = get_model_router()
+breaker = get_circuit_breaker()
+
+# Caches are keyed on the large model whichever tier produced the answer.
+MODEL_NAME = router.policy.large_model
+EDIT_THRESHOLD = float(st.secrets.get("ROUTER_EDIT_THRESHOLD", 0.75))
+STREAM_REFRESH_SECONDS = 0.05
+FOLLOWUP_MAX_TOKENS = int(st.secrets.get("FOLLOWUP_MAX_TOKENS", 700))
+ERROR_PREFIX = "❌ Error while contacting the model"
+# How close a saved answer must be to stand in while the model is unavailable.
+FALLBACK_THRESHOLD = float(st.secrets.get("BREAKER_FALLBACK_THRESHOLD", 0.5))
+
+
+def lookup_cached_guidance(user_message: str, mode: str, cache_key: str, group: str):
+    # Returns (answer, base): a cached answer, or else a near match worth adapting.
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        metrics.inc("nexo_llm_requests_total", mode=mode, source="cache")
+        return cached, None
+    semantic_cache = get_semantic_cache()
+    match = semantic_cache.lookup(user_message, group=f"{group}|{MODEL_NAME}", near_threshold=EDIT_THRESHOLD)
+    if match is not None and match[0] >= semantic_cache.threshold:
+        metrics.inc("nexo_llm_requests_total", mode=mode, source="semantic")
+        response_cache.set(cache_key, match[1])
+        return match[1], None
+    metrics.inc("nexo_llm_requests_total", mode=mode, source="model")
+    return None, match[1] if match is not None else None
+
+
+def record_usage(mode: str, usage, model: str = MODEL_NAME, tier: str = "large", template: str = ""):
+    # Runs once per real model call (inside the single-flight producer).
+    if usage is None:
+        return
+    metrics.inc("nexo_llm_tokens_total", usage.prompt_tokens or 0, mode=mode, kind="prompt", template=template)
+    metrics.inc(
+        "nexo_llm_tokens_total", usage.completion_tokens or 0, mode=mode, kind="completion", template=template
+    )
+    metrics.observe("nexo_llm_completion_tokens", usage.completion_tokens or 0, buckets=TOKEN_BUCKETS, mode=mode)
+    cost = router.cost(model, usage.prompt_tokens or 0, usage.completion_tokens or 0)
+    metrics.inc("nexo_llm_cost_usd_total", cost, mode=mode, tier=tier, model=model)
+    if usage.completion_tokens:
+        prompt_budget.record_output(mode, usage.completion_tokens)
+
+
+def retry_counter(mode: str):
+    return lambda exc: metrics.inc("nexo_llm_retries_total", mode=mode)
+
+
+def remember_guidance(user_message: str, group: str, cache_key: str, answer: str):
+    response_cache.set(cache_key, answer)
+    get_semantic_cache().add(user_message, answer, group=f"{group}|{MODEL_NAME}")
+
+
+def stored_answer(answer: str, structured: bool) -> str:
+    # What caches and history keep: a validated plan in its compact JSON
+    # form, or a markdown answer as it is.
+    if not structured:
+        return answer
+    try:
+        return parse_plan(answer).to_json()
+    except PlanError as e:
+        return f"{ERROR_PREFIX}:\n\n`The plan could not be read: {e}`"
+
+
+def stream_route(route, mode: str, template: str, messages, temperature: float, max_tokens: int,
+                 structured: bool = False):
+    # Streams one routed call; yields text deltas and returns (text, finish_reason).
+    # template is the prompt template variant, for the token metrics.
+    started = time.perf_counter()
+    extra = {"response_format": {"type": "json_object"}} if structured else {}
+    # The engine (and the groq SDK with it) is only loaded for the first real call.
+    stream = get_request_engine().stream(
+        on_retry=retry_counter(mode),
+        fallback_model=route.fallback,
+        model=route.model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout=route.timeout,
+        **extra,
+    )
+    parts, finish_reason, model, first = [], None, route.model, None
+    try:
+        for chunk in stream:
+            if first is None:
+                first = time.perf_counter() - started
+            model = getattr(chunk, "model", None) or model
+            record_usage(mode, getattr(getattr(chunk, "x_groq", None), "usage", None), model, route.tier, template)
+            if chunk.choices:
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+                if chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield parts[-1]
+    except Exception as exc:
+        if is_model_failure(exc):
+            breaker.record(False, time.perf_counter() - started)
+        else:
+            breaker.release()
+        raise
+    # Judged on time to first text: long answers are slow to finish by nature.
+    breaker.record(True, first if first is not None else time.perf_counter() - started)
+    if model != route.model:
+        metrics.inc("nexo_route_fallbacks_total", tier=route.tier, model=model)
+    metrics.inc("nexo_route_requests_total", tier=route.tier, reason=route.reason, model=model)
+    metrics.observe("nexo_route_latency_seconds", time.perf_counter() - started, tier=route.tier, model=model)
+    return "".join(parts), finish_reason
+
+
+def stream_guidance(user_message: str, mode: str, max_tokens: int = 2048, temperature: float = None,
+                    structured: bool = False):
+    # Yields text deltas as they arrive. If a fast-tier draft fails its
+    # checks, REDRAFT is yielded and the large model's answer follows.
+    # Pass temperature when consuming this off the script thread.
+    # structured asks for a JSON plan (see nexo.plans) instead of markdown.
+    started = time.perf_counter()
+    if temperature is None:
+        temperature = st.session_state.response_temperature
+    # Answers are cached per template version and format, so a prompt change starts afresh.
+    group = TEMPLATES[mode].variant(structured)
+    cache_key = make_cache_key(user_message, group, temperature, MODEL_NAME)
+    cached, base = lookup_cached_guidance(user_message, mode, cache_key, group)
+    if cached is not None:
+        yield cached
+        return
+    yield from stream_model_guidance(user_message, mode, max_tokens, temperature, structured, cache_key, base,
+                                     started=started)
+
+
+def stream_model_guidance(user_message: str, mode: str, max_tokens: int, temperature: float, structured: bool,
+                          cache_key: str, base=None, admitted: bool = False, started: float = None):
+    # The model half of stream_guidance, for a request already missed by the
+    # caches: base is the near match to adapt, and admitted says the caller
+    # already had breaker.allow() say yes.
+    started = started or time.perf_counter()
+    group = TEMPLATES[mode].variant(structured)
+
+    def produce():
+        if not admitted and not breaker.allow():
+            metrics.inc("nexo_breaker_rejected_total", mode=mode)
+            raise CircuitOpen(breaker.retry_in())
+        # Routed on the markdown prompt's size: the plan instructions are the
+        # same fixed block for everyone and shouldn't push a profile to the large tier.
+        prompt_tokens = estimate_tokens(build_messages(user_message, mode))
+        if base is not None:
+            route = router.route(mode, prompt_tokens, edit=True)
+            messages = build_edit_messages(user_message, mode, base, structured)
+        else:
+            route = router.route(mode, prompt_tokens)
+            messages = build_messages(user_message, mode, structured)
+        draft, finish_reason = yield from stream_route(
+            route, mode, group, messages, temperature, max_tokens, structured
+        )
+        problem = router.check_draft(mode, draft, finish_reason, structured) if route.tier == "fast" else None
+        if problem is not None:
+            metrics.inc("nexo_route_escalations_total", mode=mode, reason=problem)
+            yield REDRAFT
+            yield from stream_route(
+                router.escalate(problem), mode, group, build_messages(user_message, mode, structured),
+                temperature, max_tokens, structured,
+            )
+
+    def remember(answer):
+        answer = stored_answer(final_answer(answer), structured)
+        if answer.startswith(ERROR_PREFIX):
+            metrics.inc("nexo_plan_invalid_total", mode=mode)
+            return
+        remember_guidance(user_message, group, cache_key, answer)
+
+    flight = inflight.flight(cache_key, produce, remember)
+    first = True
+    try:
+        for delta in flight:
+            if first:
+                metrics.observe("nexo_llm_ttft_seconds", time.perf_counter() - started, mode=mode, template=group)
+                first = False
+            yield delta
+    except Exception:
+        metrics.inc("nexo_llm_errors_total", mode=mode)
+        raise
+    metrics.observe("nexo_llm_latency_seconds", time.perf_counter() - started, mode=mode, template=group)
+
+
+def get_guidance(user_message: str, mode: str, max_tokens: int = 2048):
+    return final_answer("".join(stream_guidance(user_message, mode, max_tokens)))
+
+
+def stream_followup(conversation: Conversation, delta: str):
+    # A follow-up sends the profile, an outline of the plan and the recent
+    # turns, never the whole plan, and goes to the fast tier as an edit.
+    mode = f"{conversation.mode}_followup"
+    started = time.perf_counter()
+    if not breaker.allow():
+        metrics.inc("nexo_breaker_rejected_total", mode=mode)
+        raise CircuitOpen(breaker.retry_in())
+    messages = conversation.messages(delta)
+    route = router.route(conversation.mode, estimate_tokens(messages), edit=True)
+    metrics.inc("nexo_llm_requests_total", mode=mode, source="model")
+    try:
+        yield from stream_route(
+            route, mode, FOLLOWUP_KEY, messages, st.session_state.response_temperature, FOLLOWUP_MAX_TOKENS
+        )
+    except Exception:
+        metrics.inc("nexo_llm_errors_total", mode=mode)
+        raise
+    metrics.observe("nexo_llm_latency_seconds", time.perf_counter() - started, mode=mode, template=FOLLOWUP_KEY)
+
+
+def draw_answer(answer: str, container=None):
+    # Stored plans are drawn from the shared HTML cache, so the browser gets
+    # ready HTML instead of re-parsing markdown on every rerun.
+    container = container or st
+    if is_plan(answer):
+        container.html(get_plan_renderer().html(answer, st.session_state.theme))
+    else:
+        container.markdown(f"<div class='ai-response'>{answer}</div>", unsafe_allow_html=True)
+
+
+def render_stream(deltas, spinner_text: str, structured: bool = False):
+    # Renders deltas into the ai-response box and returns the answer as
+    # stored_answer() keeps it. Redraws are throttled so long answers
+    # don't flood the websocket.
+    placeholder = st.empty()
+    parts = []
+    try:
+        with st.spinner(spinner_text):
+            first = next(deltas, "")
+        parts.append(first)
+        last_draw = 0.0
+        for delta in deltas:
+            parts.append(delta)
+            now = time.monotonic()
+            if now - last_draw >= STREAM_REFRESH_SECONDS:
+                # final_answer() drops a rejected fast draft once the redraft starts.
+                text = final_answer("".join(parts))
+                if structured:
+                    # Half a JSON object isn't worth drawing; show progress instead.
+                    placeholder.caption(f"✍️ Writing your plan… {len(text):,} characters")
+                else:
+                    placeholder.markdown(f"<div class='ai-response'>{text} ▌</div>", unsafe_allow_html=True)
+                last_draw = now
+        answer = stored_answer(final_answer("".join(parts)), structured)
+    except CircuitOpen:
+        # The caller shows a fallback instead of an error.
+        placeholder.empty()
+        raise
+    except Exception as e:
+        answer = f"{ERROR_PREFIX}:\n\n`{e}`"
+
+    draw_answer(answer, placeholder)
+    return answer
+
+
+def new_conversation(mode: str, user_message: str, answer: str):
+    if answer.startswith(ERROR_PREFIX):
+        return None
+    return Conversation(
+        mode, user_message, answer, max_context_tokens=int(st.secrets.get("FOLLOWUP_CONTEXT_TOKENS", 900))
+    )
+
+
+def set_conversation(conversations, mode: str, conversation):
+    if conversation is None:
+        conversations.pop(mode, None)
+    else:
+        conversations[mode] = conversation
+
+
+def start_conversation(mode: str, user_message: str, answer: str):
+    set_conversation(st.session_state.conversations, mode, new_conversation(mode, user_message, answer))
+
+
+def fallback_answer(mode: str, user_message: str, structured: bool, profile=None):
+    # Best saved answer for a similar profile, as (score, answer, source) or None:
+    # the semantic cache's nearest answer, or the nearest ready-made plan.
+    candidates = []
+    group = TEMPLATES[mode].variant(structured)
+    match = get_semantic_cache().lookup(
+        user_message, group=f"{group}|{MODEL_NAME}", near_threshold=FALLBACK_THRESHOLD
+    )
+    if match is not None:
+        candidates.append((float(match[0]), match[1], "a plan generated for a similar profile"))
+    precomputed = get_precomputed_store()
+    ready = precomputed.lookup(mode, *profile, threshold=FALLBACK_THRESHOLD) if precomputed and profile else None
+    if ready is not None:
+        label = " → ".join(part for part in (ready.education, ready.role, ready.company) if part)
+        candidates.append((ready.score, ready.answer, f"the ready-made plan for {label}"))
+    return max(candidates, key=lambda candidate: candidate[0], default=None)
+
+
+def render_fallback(mode: str, record, error: CircuitOpen):
+    # Shown instead of an error while the circuit breaker is open.
+    found = fallback_answer(mode, record["user_message"], record["structured"], record["profile"])
+    if found is None:
+        st.warning(f"⚠️ Nexo AI can't generate plans right now: {error}. Please submit again shortly.")
+        return
+    score, answer, source = found
+    metrics.inc("nexo_llm_requests_total", mode=mode, source="fallback")
+    st.warning(
+        f"⚠️ Nexo AI can't generate plans right now: {error}. Below is {source} "
+        f"({score:.0%} similar). It was not written for your profile and isn't saved to History."
+    )
+    draw_answer(answer)
+
+
+def submit_guidance(mode: str, label: str, user_message: str, spinner_text: str, max_tokens: int, summary: str,
+                    profile=None) -> bool:
+    # Cache hits and breaker fallbacks are answered here, so they never wait
+    # behind model calls on the job queue; only a real model call is queued.
+    # The worker adds that answer to history and starts the follow-up thread
+    # when it finishes, even if this session has moved on by then, so
+    # everything it needs from the session is captured here.
+    # profile (education, role, company) picks a ready-made fallback if the model is down.
+    # Returns True if an answer was drawn here.
+    temperature, structured = st.session_state.response_temperature, st.session_state.structured_plans
+    history, conversations, jobs = st.session_state.history, st.session_state.conversations, st.session_state.jobs
+    record = {
+        "id": new_job_id(), "label": label, "spinner_text": spinner_text, "structured": structured,
+        "user_message": user_message, "profile": profile,
+    }
+    group = TEMPLATES[mode].variant(structured)
+    cache_key = make_cache_key(user_message, group, temperature, MODEL_NAME)
+
+    def save(answer: str):
+        # Errors (and fallbacks shown in their place) are not answers, so they stay out of history.
+        if not answer.startswith(ERROR_PREFIX):
+            history.append(
+                mode=label,
+                timestamp=datetime.now().strftime("%Y-%m-%d %H:%M"),
+                summary=summary,
+                input=user_message,
+                output=answer,
+                preview=as_markdown(answer),
+            )
+
+    cached, base = lookup_cached_guidance(user_message, mode, cache_key, group)
+    if cached is not None:
+        # Answered here, so an older job still running on this tab gives up the follow-up thread.
+        jobs.pop(mode, None)
+        save(cached)
+        start_conversation(mode, user_message, cached)
+        draw_answer(cached)
+        return True
+    if not breaker.allow():
+        jobs.pop(mode, None)
+        metrics.inc("nexo_breaker_rejected_total", mode=mode)
+        render_fallback(mode, record, CircuitOpen(breaker.retry_in()))
+        return True
+    # Created in the script thread; the worker only reads cached resources.
+    get_semantic_cache(), get_request_engine()
+
+    def on_done(job):
+        metrics.observe("nexo_job_wait_seconds", job.started - job.created, mode=mode)
+        if job.error is None:
+            answer = stored_answer(final_answer(job.result), structured)
+        else:
+            answer = f"{ERROR_PREFIX}:\n\n`{job.error}`"
+        save(answer)
+        # A newer submit on the same tab owns the follow-up thread.
+        if jobs.get(mode, {}).get("id") == job.id:
+            set_conversation(conversations, mode, new_conversation(mode, user_message, answer))
+
+    # Recorded before the job is queued: a quick job may finish before submit() returns.
+    previous, jobs[mode] = jobs.get(mode), record
+    try:
+        get_job_queue().submit(
+            lambda: stream_model_guidance(
+                user_message, mode, max_tokens, temperature, structured, cache_key, base, admitted=True
+            ),
+            on_done=on_done,
+            job_id=record["id"],
+        )
+    except JobQueueFull:
+        # The admitted call never happens, so it doesn't count for or against the model.
+        breaker.release()
+        if previous is None:
+            jobs.pop(mode, None)
+        else:
+            jobs[mode] = previous
+        metrics.inc("nexo_jobs_rejected_total", mode=mode)
+        st.warning("Nexo AI is busy right now. Please try again in a minute.")
+    return False
+
+
+def render_job(mode: str) -> bool:
+    # Attaches to the tab's latest job: replays the text so far and streams
+    # the rest. True if the answer was drawn here.
+    record = st.session_state.jobs.get(mode)
+    job = get_job_queue().get(record["id"]) if record else None
+    if job is None:
+        st.session_state.jobs.pop(mode, None)
+        return False
+    drawn = True
+    if not job.done:
+        try:
+            render_stream(iter(job.progress), record["spinner_text"], record["structured"])
+        except CircuitOpen as e:
+            render_fallback(mode, record, e)
+    elif isinstance(job.error, CircuitOpen):
+        render_fallback(mode, record, job.error)
+    else:
+        if job.error is None:
+            answer = stored_answer(final_answer(job.result), record["structured"])
+        else:
+            answer = f"{ERROR_PREFIX}:\n\n`{job.error}`"
+        if answer.startswith(ERROR_PREFIX):
+            draw_answer(answer)
+        else:
+            # Finished while the user was elsewhere; the follow-up thread shows the plan.
+            drawn = False
+    st.session_state.jobs.pop(mode, None)
+    return drawn
+
+
+def render_followups(mode: str, label: str, fresh: bool):
+    # Follow-up chat under the tab's latest plan; fresh means the plan was
+    # already drawn above in this run.
+    conversation = st.session_state.conversations.get(mode)
+    if conversation is None:
+        return
+    if not fresh:
+        draw_answer(conversation.plan)
+    linked = get_resource_library().link(as_markdown(conversation.plan), limit=int(st.secrets.get("PLAN_RESOURCE_LINKS", 6)))
+    if linked:
+        st.markdown("📚 **Resources for this plan:** " + " • ".join(r.markdown() for r in linked))
+    for asked, reply in conversation.display:
+        with st.chat_message("user"):
+            st.markdown(asked)
+        with st.chat_message("assistant"):
+            st.markdown(f"<div class='ai-response'>{reply}</div>", unsafe_allow_html=True)
+    delta = st.chat_input("Refine this plan, e.g. “I now have 3 hrs/day”", key=f"followup_{mode}")
+    if not delta:
+        return
+    with st.chat_message("user"):
+        st.markdown(delta)
+    with st.chat_message("assistant"):
+        try:
+            reply = render_stream(stream_followup(conversation, delta), "Nexo AI is updating your plan...")
+        except CircuitOpen as e:
+            st.warning(f"⚠️ Nexo AI can't update the plan right now: {e}. Please try again shortly.")
+            return
+    if reply.startswith(ERROR_PREFIX):
+        return
+    conversation.add_turn(delta, reply)
+    st.session_state.history.append(
+        mode=f"{label} · follow-up",
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M"),
+        summary=delta,
+        input=delta,
+        output=reply,
+    )
+
+
+def request_personalised(mode: str, **request):
+    st.session_state[f"personalise_{mode}"] = request
+
+
+def render_guidance(mode: str, label: str, user_message: str, spinner_text: str, max_tokens: int, summary: str,
+                    profile) -> bool:
+    # Common profiles get a ready-made answer straight away, with a button
+    # to generate the personalised one (the next run picks that request up).
+    # Anything else goes to submit_guidance; returns True if an answer was drawn here.
+    precomputed = get_precomputed_store()
+    ready = precomputed.lookup(mode, *profile) if precomputed is not None else None
+    if ready is None:
+        return submit_guidance(mode, label, user_message, spinner_text, max_tokens, summary, profile)
+    metrics.inc("nexo_llm_requests_total", mode=mode, source="precomputed")
+    draw_answer(ready.answer)
+    ready_label = " → ".join(part for part in (ready.education, ready.role, ready.company) if part)
+    st.caption(f"Ready-made plan for **{ready_label}**. Generate one for your full profile if you like.")
+    st.button(
+        "Regenerate personalised ✨",
+        key=f"personalise_button_{mode}",
+        on_click=request_personalised,
+        args=(mode,),
+        kwargs=dict(
+            user_message=user_message, spinner_text=spinner_text, max_tokens=max_tokens, summary=summary,
+            profile=profile,
+        ),
+    )
+    st.session_state.history.append(
+        mode=label,
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M"),
+        summary=summary,
+        input=user_message,
+        output=ready.answer,
+    )
+    start_conversation(mode, user_message, ready.answer)
+    return True
+
+
+def fit_to_budget(mode: str, **fields):
+    # Compacts and trims the free-text fields; pasted resumes would otherwise go in whole.
+    fitted, decision = prompt_budget.fit(mode, fields)
+    if decision.trimmed:
+        metrics.inc("nexo_prompt_trimmed_total", mode=mode)
+    return fitted, decision
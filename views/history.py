@@ -0,0 +1,107 @@
+"""History tab: paged, searchable past plans with PDF export."""
+import time
+
+import streamlit as st
+
+from nexo.plans import as_markdown, is_plan
+from views.services import get_export_pool, get_plan_renderer
+
+
+def render_pdf(documents):
+    # fpdf2 is imported on the first export, not when the tab opens.
+    from nexo.pdf_export import render_pdf
+
+    return render_pdf(documents)
+
+
+def pdf_document(item):
+    return (f"{item.mode} – {item.timestamp}", item.summary, as_markdown(item.output))
+
+
+def render_history_entry(number, item):
+    st.markdown(f"**#{number} – {item.mode}**  ·  _{item.timestamp}_")
+    st.caption(item.summary)
+    # A collapsed expander shows only its label, so the preview goes above it.
+    preview = st.empty()
+    # The full answer is only decompressed and sent once the expander is opened.
+    expander = st.expander("View response", key=f"history_open_{item.seq}", on_change="rerun")
+    with expander:
+        if expander.open:
+            output = item.output
+            if is_plan(output):
+                st.html(get_plan_renderer().html(output, st.session_state.theme))
+            else:
+                st.markdown(output)
+            st.download_button(
+                "Download as PDF",
+                # Rendered only when clicked, not on every rerun.
+                data=lambda: render_pdf([pdf_document(item)]),
+                file_name=f"nexo_{item.mode}_{item.seq}.pdf",
+                mime="application/pdf",
+                key=f"history_pdf_{item.seq}",
+            )
+    if not expander.open:
+        preview.caption(item.preview)
+    st.markdown("---")
+
+
+@st.fragment(run_every=1)
+def wait_for_history_pdf():
+    # Polls only while the export is running; a full rerun then shows the download.
+    if st.session_state.history_pdf.done():
+        st.rerun()
+    st.caption("Preparing PDF…")
+
+
+def render():
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">History</div>', unsafe_allow_html=True)
+
+    history = st.session_state.history
+    if not history:
+        st.info("No history yet. Use **Career Direction** or **Interview Prep** and results will appear here.")
+    else:
+        page_size = int(st.secrets.get("HISTORY_PAGE_SIZE", 10))
+        page_count = history.page_count(page_size)
+        page = min(st.session_state.get("history_page", 0), page_count - 1)
+
+        query = st.text_input(
+            "Search history", placeholder="e.g. SQL, Data Analyst, TCS NQT", key="history_query"
+        )
+        if query.strip():
+            started = time.perf_counter()
+            results = history.search(query, limit=int(st.secrets.get("HISTORY_SEARCH_LIMIT", 20)))
+            st.caption(f"{len(results)} matching plans • {(time.perf_counter() - started) * 1000:.0f} ms")
+            for i, item in enumerate(results, start=1):
+                render_history_entry(i, item)
+        else:
+            for i, item in enumerate(history.page(page, page_size), start=page * page_size + 1):
+                render_history_entry(i, item)
+
+        if page_count > 1 and not query.strip():
+            col_prev, col_page, col_next = st.columns([0.2, 0.6, 0.2])
+            if col_prev.button("← Newer", disabled=page == 0):
+                st.session_state.history_page = page - 1
+                st.rerun()
+            col_page.caption(f"Page {page + 1} of {page_count} • {len(history)} entries")
+            if col_next.button("Older →", disabled=page >= page_count - 1):
+                st.session_state.history_page = page + 1
+                st.rerun()
+
+        if st.button("Prepare PDF of all history"):
+            documents = [pdf_document(item) for item in history.iter_newest()]
+            st.session_state.history_pdf = get_export_pool().submit(render_pdf, documents)
+        export = st.session_state.get("history_pdf")
+        if export is not None and not export.done():
+            wait_for_history_pdf()
+        elif export is not None and export.exception() is not None:
+            st.error(f"PDF export failed: {export.exception()}")
+        elif export is not None:
+            st.download_button(
+                "Download all history as PDF",
+                data=export.result(),
+                file_name="nexo_history.pdf",
+                mime="application/pdf",
+            )
+
+    st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,21 @@
+"""Home page: the four tabs, of which only the open one runs."""
+import importlib
+
+import streamlit as st
+
+TAB_MODULES = {
+    "Career Direction": "views.career",
+    "Interview Prep": "views.interview",
+    "Library": "views.library",
+    "History": "views.history",
+}
+
+
+def render():
+    # Switching tabs reruns the script, so closed tabs are skipped entirely:
+    # their module is imported and rendered the first time they are opened.
+    tabs = st.tabs(list(TAB_MODULES), key="home_tab", on_change="rerun")
+    for tab, module in zip(tabs, TAB_MODULES.values()):
+        if tab.open:
+            with tab:
+                importlib.import_module(module).render()
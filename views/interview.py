@@ -0,0 +1,100 @@
+"""Interview Prep tab: topics, strategy and sample questions for a target role."""
+import streamlit as st
+
+from nexo.prompts import build_interview_prompt
+from views.guidance import (
+    fit_to_budget,
+    render_followups,
+    render_guidance,
+    render_job,
+    submit_guidance,
+)
+
+
+def render():
+    left_i, right_i = st.columns([0.63, 0.37])
+
+    with left_i:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown('<div class="section-title">Interview Preparation</div>', unsafe_allow_html=True)
+        st.caption("Get topics, strategy and sample questions for your next interview.")
+
+        with st.form("interview_form"):
+            role = st.text_input(
+                "Target role",
+                placeholder="e.g. SDE-1, Data Analyst, DevOps Engineer…",
+                key="interview_role",
+                persist_state="session",
+            )
+            company = st.text_input(
+                "Company / type of company",
+                placeholder="e.g. Product company, TCS NQT, Infosys, JP Morgan virtual, any…",
+                key="interview_company",
+                persist_state="session",
+            )
+            experience = st.text_input(
+                "Experience level",
+                placeholder="Final year / Fresher / 1 year exp…",
+                key="interview_experience",
+                persist_state="session",
+            )
+            strong_areas = st.text_area(
+                "Strong areas",
+                placeholder="e.g. DSA, DBMS, projects in web dev / ML, communication…",
+                height=80,
+                key="interview_strong_areas",
+                persist_state="session",
+            )
+            weak_areas = st.text_area(
+                "Weak areas",
+                placeholder="e.g. system design, probability & stats, confidence in English…",
+                height=80,
+                key="interview_weak_areas",
+                persist_state="session",
+            )
+            upcoming = st.text_input(
+                "Upcoming interview / exam (optional)",
+                placeholder="e.g. TCS NQT on 5 Dec, JP Morgan test, college placement drive…",
+                key="interview_upcoming",
+                persist_state="session",
+            )
+
+            submit_interview = st.form_submit_button("Generate Interview Plan 🎙️")
+
+        personalise = st.session_state.pop("personalise_interview_prep", None)
+        fresh = False
+        if submit_interview:
+            fields, budget = fit_to_budget(
+                "interview_prep", role=role, company=company, experience=experience,
+                strong_areas=strong_areas, weak_areas=weak_areas, upcoming=upcoming,
+            )
+            if budget.trimmed:
+                st.caption(f"Long input was shortened to fit: {', '.join(budget.trimmed)}.")
+            fresh = render_guidance(
+                "interview_prep",
+                "Interview Prep",
+                build_interview_prompt(**fields),
+                spinner_text="Nexo AI is preparing your interview strategy...",
+                max_tokens=budget.max_tokens,
+                summary=f"{role} | {company}",
+                profile=(experience, role, company),
+            )
+        elif personalise is not None:
+            fresh = submit_guidance("interview_prep", "Interview Prep", **personalise)
+        fresh = render_job("interview_prep") or fresh
+        render_followups("interview_prep", "Interview Prep", fresh=fresh)
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with right_i:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown('<div class="section-title">Checklist</div>', unsafe_allow_html=True)
+        st.markdown(
+            """
+- At least **1–2 projects** you can explain well.  
+- Basics of **DSA, OOP, DBMS, OS** (for SDE roles).  
+- Practice **HR answers**: intro, strengths, failures, why this company.  
+- Note down Nexo AI’s plan and tick items as you complete them.
+            """
+        )
+        st.markdown("</div>", unsafe_allow_html=True)
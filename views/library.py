@@ -0,0 +1,56 @@
+"""Library tab: searchable, filterable catalogue of learning resources."""
+import time
+
+import streamlit as st
+
+from nexo.library import TRACKS
+from views.services import get_resource_library
+
+
+def render():
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">Library</div>', unsafe_allow_html=True)
+    st.caption("Official docs and high-quality learning resources.")
+
+    library = get_resource_library()
+    col_query, col_track = st.columns([0.55, 0.45])
+    library_query = col_query.text_input(
+        "Search resources", placeholder="e.g. SQL, Docker, system design", key="library_query"
+    )
+    counts = library.track_counts()
+    track = col_track.segmented_control(
+        "Track",
+        TRACKS,
+        format_func=lambda t: f"{t} ({counts[t]})",
+        key="library_track",
+    )
+    page_size = int(st.secrets.get("LIBRARY_PAGE_SIZE", 20))
+    # A new query or track starts again from the first page.
+    if st.session_state.get("library_filter") != (library_query, track):
+        st.session_state.library_filter = (library_query, track)
+        st.session_state.library_page = 0
+    page = st.session_state.get("library_page", 0)
+
+    started = time.perf_counter()
+    resources, total = library.search(library_query, track, page, page_size)
+    page_count = max(1, -(-total // page_size))
+    st.caption(f"{total} resources • {(time.perf_counter() - started) * 1000:.1f} ms")
+    if resources:
+        st.markdown("\n".join(
+            f"- {r.markdown()} · _{r.topic}_" + ("" if track else f" · {r.track}") for r in resources
+        ))
+    else:
+        st.info("No resources match. Try a broader word or another track.")
+
+    if page_count > 1:
+        col_prev, col_page, col_next = st.columns([0.2, 0.6, 0.2])
+        if col_prev.button("← Previous", disabled=page == 0, key="library_prev"):
+            st.session_state.library_page = page - 1
+            st.rerun()
+        col_page.caption(f"Page {page + 1} of {page_count}")
+        if col_next.button("Next →", disabled=page >= page_count - 1, key="library_next"):
+            st.session_state.library_page = page + 1
+            st.rerun()
+
+
+    st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,254 @@
+"""Process-wide resources shared by every page and session.
+
+Each getter is cached with st.cache_resource and imports what it needs on
+first call, so groq, numpy and friends load only when a page first uses them.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from nexo.metrics import MetricsRegistry, start_metrics_server
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def app_path(path: str) -> str:
+    # Relative paths in secrets are relative to the app, not the working directory.
+    return os.path.join(APP_DIR, path)
+
+
+@st.cache_resource(show_spinner=False)
+def get_metrics():
+    registry = MetricsRegistry()
+    registry.describe("nexo_llm_requests_total", "Guidance requests by mode and where the answer came from.")
+    registry.describe("nexo_llm_ttft_seconds", "Time from submit to the first answer text.")
+    registry.describe("nexo_llm_latency_seconds", "Time from submit to the complete answer.")
+    registry.describe("nexo_llm_tokens_total", "Prompt and completion tokens reported by the model, per prompt template.")
+    registry.describe("nexo_llm_completion_tokens", "Completion tokens per model call.")
+    registry.describe("nexo_llm_retries_total", "Retried model calls (429/5xx/connection errors).")
+    registry.describe("nexo_llm_errors_total", "Guidance requests that ended in an error.")
+    registry.describe("nexo_script_run_seconds", "Wall time of one Streamlit script run.")
+    registry.describe("nexo_route_requests_total", "Model calls per routing tier, reason and answering model.")
+    registry.describe("nexo_route_latency_seconds", "Duration of one routed model call.")
+    registry.describe("nexo_route_escalations_total", "Fast-tier drafts redone on the large model, by failed check.")
+    registry.describe("nexo_route_fallbacks_total", "Calls answered by the other tier after a 429 or timeout.")
+    registry.describe("nexo_llm_cost_usd_total", "Estimated model spend from token usage and list prices.")
+    registry.describe("nexo_prompt_trimmed_total", "Submits whose form input was trimmed to the mode's budget.")
+    registry.describe("nexo_job_wait_seconds", "Time a generation job waited in the queue for a worker.")
+    registry.describe("nexo_jobs_rejected_total", "Submits turned away because the job queue was full.")
+    registry.describe("nexo_plan_invalid_total", "Structured answers that failed plan validation.")
+    registry.describe("nexo_breaker_transitions_total", "Model circuit breaker state changes, by new state.")
+    registry.describe("nexo_breaker_rejected_total", "Model calls refused because the circuit breaker was open.")
+    port = st.secrets.get("METRICS_PORT")
+    if port:
+        start_metrics_server(registry, int(port))
+    return registry
+
+
+@st.cache_resource(show_spinner=False)
+def configure_logging():
+    # Budget decisions and other nexo.* records go to the server log.
+    # Only the nexo logger, so the HTTP client's per-request lines stay quiet.
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+    logger = logging.getLogger("nexo")
+    logger.addHandler(handler)
+    logger.setLevel(st.secrets.get("LOG_LEVEL", "INFO"))
+
+
+@st.cache_resource(show_spinner=False)
+def get_state_backend():
+    # Set STATE_BACKEND_URL (e.g. redis://cache:6379/0) when running several
+    # replicas, so they share the response cache, rate limits and history.
+    from nexo.state import make_state
+
+    return make_state(st.secrets.get("STATE_BACKEND_URL", ""), st.secrets.get("STATE_KEY_PREFIX", "nexo:"))
+
+
+@st.cache_resource(show_spinner=False)
+def get_history_store():
+    # Every user's history, durable across sessions and restarts.
+    path = app_path(st.secrets.get("HISTORY_DB_PATH", "data/nexo_history.db"))
+    store = get_state_backend().history_store(path)
+    store.prune(max_age_seconds=float(st.secrets.get("HISTORY_RETENTION_DAYS", 365)) * 86400)
+    return store
+
+
+@st.cache_resource(show_spinner=False)
+def get_groq_client():
+    # Retries are handled by the request engine, not the SDK.
+    from groq import Groq
+
+    return Groq(api_key=st.secrets["GROQ_API_KEY"], max_retries=0)
+
+
+@st.cache_resource(show_spinner=False)
+def get_request_engine():
+    # One engine per process: every session's calls share its pool. The rate
+    # limits are the account's, so with a shared backend all replicas draw on them.
+    from nexo.engine import RequestEngine
+
+    return RequestEngine(
+        get_groq_client(),
+        max_in_flight=int(st.secrets.get("LLM_MAX_IN_FLIGHT", 8)),
+        requests_per_minute=float(st.secrets.get("GROQ_REQUESTS_PER_MINUTE", 30)),
+        tokens_per_minute=float(st.secrets.get("GROQ_TOKENS_PER_MINUTE", 8000)),
+        max_retries=int(st.secrets.get("LLM_MAX_RETRIES", 4)),
+        bucket_factory=get_state_backend().token_bucket,
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_batch_engine():
+    # Cohort batches get their own engine and rate budget, so a 300-row file
+    # can't starve live users. Split the account's limits between
+    # GROQ_REQUESTS_PER_MINUTE and BATCH_REQUESTS_PER_MINUTE (same for tokens).
+    from nexo.engine import RequestEngine
+
+    state = get_state_backend()
+    return RequestEngine(
+        get_groq_client(),
+        max_in_flight=int(st.secrets.get("BATCH_CONCURRENCY", 4)),
+        requests_per_minute=float(st.secrets.get("BATCH_REQUESTS_PER_MINUTE", 10)),
+        tokens_per_minute=float(st.secrets.get("BATCH_TOKENS_PER_MINUTE", 2000)),
+        max_retries=int(st.secrets.get("LLM_MAX_RETRIES", 4)),
+        bucket_factory=lambda name, rate_per_minute: state.token_bucket(f"batch_{name}", rate_per_minute),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_batch_runs():
+    # Cohort runs take minutes, so they run on this pool instead of in the
+    # script run; runs beyond BATCH_RUNS wait their turn.
+    from nexo.batch import BatchRuns
+
+    return BatchRuns(
+        ThreadPoolExecutor(max_workers=int(st.secrets.get("BATCH_RUNS", 1)), thread_name_prefix="nexo-batch-run")
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache():
+    # Shared by every session in this process; behind it, an optional SQLite
+    # file that survives restarts, or the shared backend's store.
+    from nexo.cache import ResponseCache
+
+    ttl_seconds = float(st.secrets.get("RESPONSE_CACHE_TTL_SECONDS", 6 * 3600))
+    sqlite_path = st.secrets.get("RESPONSE_CACHE_PATH")
+    return ResponseCache(
+        max_entries=int(st.secrets.get("RESPONSE_CACHE_SIZE", 512)),
+        ttl_seconds=ttl_seconds,
+        store=get_state_backend().cache_store(ttl_seconds, app_path(sqlite_path) if sqlite_path else None),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_semantic_cache():
+    # Near-duplicate profiles ("Python, DSA, basic ML" vs "python + dsa + some ML").
+    from nexo.semantic import SemanticCache
+
+    return SemanticCache(
+        # Tuned with bench/bench_semantic_index.py --check: rewordings score
+        # 0.97+, profiles with other skills 0.84 and below.
+        threshold=float(st.secrets.get("SEMANTIC_CACHE_THRESHOLD", 0.95)),
+        field_threshold=float(st.secrets.get("SEMANTIC_FIELD_THRESHOLD", 0.8)),
+        max_items=int(st.secrets.get("SEMANTIC_CACHE_MAX_ITEMS", 100_000)),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_single_flight():
+    # Identical prompts submitted at the same time share one model call.
+    from nexo.singleflight import SingleFlight
+
+    return SingleFlight()
+
+
+@st.cache_resource(show_spinner=False)
+def get_prompt_budget():
+    # Output lengths are learned across all sessions, so this is process-wide too.
+    from nexo.budget import PromptBudget
+
+    return PromptBudget(
+        input_budgets=dict(st.secrets.get("PROMPT_INPUT_BUDGETS", {})),
+        max_tokens_ceiling=int(st.secrets.get("LLM_MAX_TOKENS", 2048)),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_precomputed_store():
+    # Built offline by `python -m nexo.precomputed`; opened read-only and
+    # memory-mapped, so answers are paged in only as they are served.
+    path = app_path(st.secrets.get("PRECOMPUTED_PATH", "data/precomputed.db"))
+    if not os.path.exists(path):
+        return None
+    from nexo.precomputed import PrecomputedStore
+
+    return PrecomputedStore(path, threshold=float(st.secrets.get("PRECOMPUTED_THRESHOLD", 0.8)))
+
+
+@st.cache_resource(show_spinner=False)
+def get_resource_library():
+    # Loaded and indexed once per process; searches and plan links are local lookups.
+    from nexo.library import ResourceLibrary
+
+    return ResourceLibrary.from_json(app_path(st.secrets.get("LIBRARY_PATH", "data/library.json")))
+
+
+@st.cache_resource(show_spinner=False)
+def get_plan_renderer():
+    # Structured plans are turned into HTML once per (plan, theme) for every session.
+    from nexo.plans import PlanRenderer
+
+    return PlanRenderer(max_entries=int(st.secrets.get("PLAN_HTML_CACHE_SIZE", 512)))
+
+
+@st.cache_resource(show_spinner=False)
+def get_export_pool():
+    # Whole-history PDF exports render here so the script run isn't blocked.
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="nexo-pdf")
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_queue():
+    # Generations run here rather than in the script run, so a rerun or a
+    # page switch mid-answer doesn't lose it.
+    from nexo.jobs import JobQueue
+
+    return JobQueue(
+        workers=int(st.secrets.get("JOB_WORKERS", st.secrets.get("LLM_MAX_IN_FLIGHT", 8))),
+        max_queued=int(st.secrets.get("JOB_QUEUE_SIZE", 64)),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_circuit_breaker():
+    # Per process: each replica judges the model by the calls it makes itself.
+    from nexo.breaker import CircuitBreaker
+
+    metrics = get_metrics()
+    return CircuitBreaker(
+        window=int(st.secrets.get("BREAKER_WINDOW", 20)),
+        min_calls=int(st.secrets.get("BREAKER_MIN_CALLS", 5)),
+        error_rate=float(st.secrets.get("BREAKER_ERROR_RATE", 0.5)),
+        slow_seconds=float(st.secrets.get("BREAKER_SLOW_SECONDS", 10)),
+        slow_rate=float(st.secrets.get("BREAKER_SLOW_RATE", 0.5)),
+        open_seconds=float(st.secrets.get("BREAKER_OPEN_SECONDS", 30)),
+        on_change=lambda state: metrics.inc("nexo_breaker_transitions_total", state=state),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_model_router():
+    # Thresholds are tuned from the nexo_route_* latency and cost series on the Admin page.
+    from nexo.engine import DEFAULT_MODEL
+    from nexo.router import FAST_MODEL, ModelRouter, RoutePolicy
+
+    return ModelRouter(RoutePolicy(
+        fast_model=st.secrets.get("FAST_MODEL", FAST_MODEL),
+        large_model=st.secrets.get("LARGE_MODEL", DEFAULT_MODEL),
+        fast_max_prompt_tokens=int(st.secrets.get("ROUTER_FAST_MAX_PROMPT_TOKENS", 220)),
+        large_modes=tuple(st.secrets.get("ROUTER_LARGE_MODES", ())),
+    ))
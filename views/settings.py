@@ -0,0 +1,83 @@
+"""Settings page: theme, response style, cache stats and history."""
+import uuid
+
+import streamlit as st
+
+from views.services import (
+    get_plan_renderer,
+    get_precomputed_store,
+    get_response_cache,
+    get_semantic_cache,
+    get_single_flight,
+)
+
+
+def render():
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">Settings</div>', unsafe_allow_html=True)
+
+    st.markdown("##### Theme")
+    theme_choice = st.radio(
+        "Choose theme",
+        ["Dark", "Light"],
+        index=0 if st.session_state.theme == "dark" else 1,
+    )
+    new_theme = "dark" if theme_choice == "Dark" else "light"
+    if new_theme != st.session_state.theme:
+        st.session_state.theme = new_theme
+        st.rerun()
+
+    st.markdown("##### Response Style")
+    temp = st.slider(
+        "Creativity (temperature)",
+        min_value=0.0,
+        max_value=1.0,
+        value=float(st.session_state.response_temperature),
+        step=0.1,
+        help="Lower = more strict and deterministic; higher = more creative.",
+    )
+    st.session_state.response_temperature = temp
+    st.session_state.structured_plans = st.toggle(
+        "Structured plans",
+        value=st.session_state.structured_plans,
+        help="Plans come back as phases (0–3, 3–12, 12–36 months) with prioritised topics "
+        "and sample questions instead of free-form text. They appear once complete "
+        "rather than word by word.",
+    )
+
+    st.markdown("##### Response Cache")
+    cache_stats = get_response_cache().stats()
+    st.caption(
+        f"{cache_stats['entries']} cached answers • {cache_stats['hits']} hits / "
+        f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%} hit rate)"
+    )
+    semantic_cache, inflight = get_semantic_cache(), get_single_flight()
+    st.caption(
+        f"Similar-profile matches: {semantic_cache.hits} served from "
+        f"{len(semantic_cache)} stored answers • {inflight.shared} requests joined an "
+        f"identical in-flight call"
+    )
+    precomputed = get_precomputed_store()
+    if precomputed is not None:
+        st.caption(f"Ready-made plans: {precomputed.hits} served from {len(precomputed)} precomputed profiles")
+    renderer = get_plan_renderer()
+    st.caption(f"Rendered plans: {len(renderer)} cached • {renderer.hits} hits / {renderer.misses} renders")
+
+    st.markdown("##### History")
+    st.caption(
+        "History is linked to this browser by an anonymous cookie, not to the page address, "
+        "so sharing a link never shares your plans."
+    )
+    if st.button("Clear all history"):
+        st.session_state.history.clear()
+        st.session_state.pop("history_pdf", None)
+        st.success("All saved history for this browser was deleted, including in its other tabs.")
+    if st.button("Forget this browser", help="Deletes your history and starts over with a new anonymous ID."):
+        st.session_state.history.clear()
+        st.session_state.pop("history_pdf", None)
+        # The app makes a fresh history and cookie for the new ID on the rerun.
+        st.session_state.user_token = uuid.uuid4().hex
+        del st.session_state.history
+        st.rerun()
+
+    st.markdown("</div>", unsafe_allow_html=True)